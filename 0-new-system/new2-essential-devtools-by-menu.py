@@ -1,68 +1,100 @@
 #!/usr/bin/env python3
 # Author: Roy Wiseman 2025-02
 import os
+import atexit
 import curses
+import itertools
+import shutil
 import subprocess
 import time
 import signal
 import sys
-from datetime import datetime
 
 LOG_FILE = "/tmp/python_app_installer_menus.log"
 
-# Associative array of essential apps and their descriptions
-ESSENTIAL_APPS = {
-    "ack-grep": "A tool like grep, optimized for programmers (often 'ack' or 'ack-grep' package).",
-    "awscli": "AWS Command Line Interface.",
-    "build-essential": "Development tools meta-package (gcc, g++, make, etc.).",
-    "cargo": "Rust package manager and build system (often installed with rustc).",
-    "clang": "Alternative C/C++/Objective-C compiler (LLVM based).",
-    "cmake": "Cross-platform build system generator.",
-    "default-jdk": "Java Development Kit (standard OpenJDK version).",
-    "gcc": "GNU C Compiler.",
-    "gdb": "GNU Debugger.",
-    "git": "Fast, scalable, distributed revision control system.",
-    "goaccess": "Real-time web log analyzer and interactive viewer for terminal or browser.",
-    "golang": "Go programming language compiler, tools, and libraries (metapackage, consider 'golang-go').",
-    "google-cloud-sdk": "Command-line tools for Google Cloud Platform.",
-    "gradle": "Powerful build automation tool for Java, Groovy, Scala, etc.",
-    "jupyter-notebook": "Web-based interactive computational environment (Jupyter Notebook).",
-    "maven": "Java project management and comprehension tool (Apache Maven).",
-    "nodejs": "Node.js event-based server-side JavaScript runtime.",
-    "php": "PHP server-side scripting language (metapackage).",
-    "php-cli": "Command-line interpreter for PHP.",
-    "php-curl": "cURL module for PHP.",
-    "php-fpm": "FastCGI Process Manager for PHP.",
-    "php-gd": "GD module for PHP (image manipulation).",
-    "php-mbstring": "MBSTRING module for PHP (multibyte string functions).",
-    "php-mysql": "MySQL module for PHP.",
-    "php-pgsql": "PostgreSQL module for PHP.",
-    "php-xml": "XML module for PHP.",
-    "php-zip": "Zip module for PHP.",
-    "python3-certbot-apache": "Apache plugin for Certbot.",
-    "python3-certbot-nginx": "Nginx plugin for Certbot.",
-    "python3-csvkit": "csvkit: a suite of command-line tools for converting and working with CSV.",
-    "python3-pip": "Python package installer for Python 3.",
-    "python3-virtualenv": "Tool to create isolated Python environments (for Python 3).",
-    "ruby-full": "Ruby programming language (full installation including headers).",
-    "rustc": "Rust compiler.",
-    "valgrind": "Instrumentation framework for building dynamic analysis tools (memory debugging, profiling).",
-}
-
-INSTALL_COMMAND_TEMPLATE = "sudo apt-get install -y {packages}"
+# Essential apps and their descriptions, kept in alphabetical order (the menu shows them as listed)
+ESSENTIAL_APPS = (
+    ("ack-grep", "A tool like grep, optimized for programmers (often 'ack' or 'ack-grep' package)."),
+    ("awscli", "AWS Command Line Interface."),
+    ("build-essential", "Development tools meta-package (gcc, g++, make, etc.)."),
+    ("cargo", "Rust package manager and build system (often installed with rustc)."),
+    ("clang", "Alternative C/C++/Objective-C compiler (LLVM based)."),
+    ("cmake", "Cross-platform build system generator."),
+    ("default-jdk", "Java Development Kit (standard OpenJDK version)."),
+    ("gcc", "GNU C Compiler."),
+    ("gdb", "GNU Debugger."),
+    ("git", "Fast, scalable, distributed revision control system."),
+    ("goaccess", "Real-time web log analyzer and interactive viewer for terminal or browser."),
+    ("golang", "Go programming language compiler, tools, and libraries (metapackage, consider 'golang-go')."),
+    ("google-cloud-sdk", "Command-line tools for Google Cloud Platform."),
+    ("gradle", "Powerful build automation tool for Java, Groovy, Scala, etc."),
+    ("jupyter-notebook", "Web-based interactive computational environment (Jupyter Notebook)."),
+    ("maven", "Java project management and comprehension tool (Apache Maven)."),
+    ("nodejs", "Node.js event-based server-side JavaScript runtime."),
+    ("php", "PHP server-side scripting language (metapackage)."),
+    ("php-cli", "Command-line interpreter for PHP."),
+    ("php-curl", "cURL module for PHP."),
+    ("php-fpm", "FastCGI Process Manager for PHP."),
+    ("php-gd", "GD module for PHP (image manipulation)."),
+    ("php-mbstring", "MBSTRING module for PHP (multibyte string functions)."),
+    ("php-mysql", "MySQL module for PHP."),
+    ("php-pgsql", "PostgreSQL module for PHP."),
+    ("php-xml", "XML module for PHP."),
+    ("php-zip", "Zip module for PHP."),
+    ("python3-certbot-apache", "Apache plugin for Certbot."),
+    ("python3-certbot-nginx", "Nginx plugin for Certbot."),
+    ("python3-csvkit", "csvkit: a suite of command-line tools for converting and working with CSV."),
+    ("python3-pip", "Python package installer for Python 3."),
+    ("python3-virtualenv", "Tool to create isolated Python environments (for Python 3)."),
+    ("ruby-full", "Ruby programming language (full installation including headers)."),
+    ("rustc", "Rust compiler."),
+    ("valgrind", "Instrumentation framework for building dynamic analysis tools (memory debugging, profiling)."),
+)
+APP_NAMES = tuple(name for name, _ in ESSENTIAL_APPS)
+APP_DESCS = tuple(desc for _, desc in ESSENTIAL_APPS)
+# Descriptions split into screen lines once, ready for the description footer
+APP_DESC_LINES = tuple(tuple(desc.split('\n')) for desc in APP_DESCS)
+
+# Rows under the grid for the instructions and description lines
+FOOTER_HEIGHT = 5
+# Smallest usable terminal: the footer plus one row of items, and room for the warning text
+MIN_HEIGHT = FOOTER_HEIGHT + 1
+MIN_WIDTH = 20
+
+# The package names are appended to this argv, which is run directly rather than through a shell
+INSTALL_COMMAND = ["sudo", "apt-get", "install", "-y"]
+
+# apt output is passed through in chunks of up to this many bytes rather than line by line
+OUTPUT_CHUNK_SIZE = 65536
+
+# The log is opened once and written through a 64 KB buffer, instead of being reopened
+# for every message; closing it at exit flushes whatever is still buffered
+_log_file = open(LOG_FILE, "a", buffering=65536)
+atexit.register(_log_file.close)
 
 def log_message(message):
-    with open(LOG_FILE, "a") as log_file:
-        log_file.write(f"{datetime.now()}: {message}\n")
+    _log_file.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')}: {message}\n")
 
-def display_menu(stdscr, app_definitions):
+def display_menu(stdscr, app_names, app_desc_lines):
     curses.curs_set(0)
+    stdscr.timeout(-1) # Block in getch until a key (or KEY_RESIZE) arrives, so the menu idles at 0% CPU
     curses.start_color()
     curses.init_pair(1, curses.COLOR_BLACK, curses.COLOR_WHITE)  # Highlighted
     curses.init_pair(2, curses.COLOR_WHITE, curses.COLOR_BLACK)  # Normal
     curses.init_pair(3, curses.COLOR_RED, curses.COLOR_BLACK)    # Error
-
-    app_names = sorted(list(app_definitions.keys()))
+    # Attributes and key codes the loop compares against, bound to locals once
+    highlighted_attr = curses.color_pair(1)
+    normal_attr = curses.color_pair(2)
+    error_attr = curses.color_pair(3)
+    bold_attr = curses.A_BOLD
+    key_up, key_down, key_left, key_right = curses.KEY_UP, curses.KEY_DOWN, curses.KEY_LEFT, curses.KEY_RIGHT
+    key_ppage, key_npage, key_home, key_end = curses.KEY_PPAGE, curses.KEY_NPAGE, curses.KEY_HOME, curses.KEY_END
+    key_resize = curses.KEY_RESIZE
+    key_space = ord(" ")
+    install_keys = (ord("i"), ord("I"), ord("x"))
+    quit_keys = (ord("q"), ord("Q"))
+
+    # The app list never changes while the menu is up, so size the grid cells once
     if not app_names:
         stdscr.addstr(0,0, "No applications loaded. Check ESSENTIAL_APPS.")
         stdscr.refresh()
@@ -70,216 +102,176 @@ def display_menu(stdscr, app_definitions):
         stdscr.getch()
         return None
 
-    checked_apps = {app_name: False for app_name in app_names}
+    # app_names is fixed, so only the navigation keys below can move the index, and they stay in range
+    num_apps = len(app_names)
+    last_app_idx = num_apps - 1
+    max_app_name_len = max(len(name) for name in app_names)
+    option_width_on_screen = max_app_name_len + 4 + 2 # [X] name  <space><space>
+    # Both checkbox states of every cell are formatted once, padded to the column width
+    # (which only depends on the names, so a resize never invalidates them)
+    unchecked_strs = [f"[ ] {name:<{max_app_name_len}}" for name in app_names]
+    checked_strs = [f"[X] {name:<{max_app_name_len}}" for name in app_names]
+    cell_strs = (unchecked_strs, checked_strs)
+
+    # One flag byte per app, indexed like app_names (1 = checked)
+    checked_flags = bytearray(num_apps)
     select_all_apps = False
     
     # Grid navigation variables
-    current_grid_row = 0    # Current row in the displayed grid column
-    current_grid_col = 0    # Current column in the displayed grid
     highlighted_linear_idx = 0 # Linear index of the highlighted app
+    first_visible_col = 0   # Grid column shown at the left edge; scrolls to follow the highlight
+
+    # Damage tracking: only the cells that changed are redrawn between keypresses
+    dirty_full = True # Redraw the whole screen (first pass, resize, Ctrl+A)
+    prev_highlighted_linear_idx = None # Highlighted cell currently on screen
+    needs_redraw = True # False after a key that changed nothing, so the frame is skipped
+
+    def draw_cell(idx, highlighted):
+        """Draw one grid cell, using the layout worked out in the loop below."""
+        grid_col = idx // num_display_rows - first_visible_col
+        if not 0 <= grid_col < num_display_columns: # Item is in a column that's off screen
+            return
+        screen_x = grid_col * option_width_on_screen
+        screen_y = idx % num_display_rows
+        display_string = cell_strs[checked_flags[idx]][idx]
+        stdscr.addnstr(screen_y, screen_x, display_string, option_width_on_screen - 2,
+                       highlighted_attr if highlighted else normal_attr)
+
+    # Navigation keys. Each handler takes the highlighted index and returns the new one; items
+    # run down each column in turn, so moving by one row is +/-1 and by one column is +/-rows.
+    nav_handlers = {
+        # Up/Down step through the items in order, wrapping between the bottom and top of columns
+        key_up: lambda idx: idx - 1 if idx > 0 else idx,
+        key_down: lambda idx: idx + 1 if idx < last_app_idx else idx,
+        # Left/Right keep the row, landing on the last item if the next column is shorter
+        key_left: lambda idx: idx - num_display_rows if idx >= num_display_rows else idx,
+        key_right: lambda idx: (min(idx + num_display_rows, last_app_idx)
+                                if idx - idx % num_display_rows + num_display_rows < num_apps else idx),
+        key_ppage: lambda idx: max(0, idx - num_display_rows),
+        key_npage: lambda idx: min(last_app_idx, idx + num_display_rows),
+        key_home: lambda idx: 0,
+        key_end: lambda idx: last_app_idx,
+    }
 
     while True:
         try:
-            stdscr.clear()
             height, width = stdscr.getmaxyx()
 
             # Minimum size check
-            footer_height_needed = 5 # For instructions and description lines
-            if height < footer_height_needed + 1 or width < 20: # Need at least 1 row for items
-                stdscr.attron(curses.color_pair(3))
-                stdscr.addstr(0, 0, "Terminal too small.")
-                stdscr.attroff(curses.color_pair(3))
+            if height < MIN_HEIGHT or width < MIN_WIDTH:
+                stdscr.clear()
+                dirty_full = True
+                needs_redraw = True
+                stdscr.addstr(0, 0, "Terminal too small.", error_attr)
                 stdscr.refresh()
-                time.sleep(1)
-                key = stdscr.getch()
-                if key == ord('q') or key == ord('Q'): return None
+                key = stdscr.getch() # Wait for 'q' or a resize, then check the size again
+                if key in quit_keys: return None
                 continue
 
             # Calculate columns and rows for the grid
-            # Max app name length plus "[X] " prefix and a little padding
-            max_app_name_len = 0
-            if app_names:
-                 max_app_name_len = max(len(name) for name in app_names)
-            
-            option_width_on_screen = max_app_name_len + 4 + 2 # [X] name  <space><space>
-            num_display_columns = max(1, width // option_width_on_screen)
+            # Only columns that fit entirely on screen are drawn
+            num_display_columns = width // option_width_on_screen
             
             # num_display_rows is how many items fit vertically in each column of the grid
-            num_display_rows = height - footer_height_needed 
+            num_display_rows = height - FOOTER_HEIGHT
             if num_display_rows < 1: num_display_rows = 1
 
 
-            # Ensure highlighted_linear_idx is valid (e.g. after resize or if list is short)
-            highlighted_linear_idx = max(0, min(highlighted_linear_idx, len(app_names) -1))
-            if not app_names: highlighted_linear_idx = 0
-
-
-            # Update current_grid_col and current_grid_row based on highlighted_linear_idx
-            # Items are laid out column by column.
-            # So, col_index = linear_idx // num_items_per_col_on_screen
-            #    row_index_in_col = linear_idx % num_items_per_col_on_screen
-            if num_display_rows > 0 : # Avoid division by zero if num_display_rows is 0
-                current_grid_col = highlighted_linear_idx // num_display_rows
-                current_grid_row = highlighted_linear_idx % num_display_rows
-            else: # Should not happen if height check is correct
-                current_grid_col = 0
-                current_grid_row = 0
-
-
-            # Display the menu in a grid layout
-            for idx, app_name in enumerate(app_names):
-                # Determine the display col and row for this app_name
-                display_col_for_item = idx // num_display_rows
-                display_row_for_item = idx % num_display_rows
+            # Items are laid out column by column, so col_index = linear_idx // num_display_rows
+            current_grid_col = highlighted_linear_idx // num_display_rows
+
+            # Scroll the viewport sideways when the highlight moves past either edge
+            if current_grid_col < first_visible_col:
+                first_visible_col = current_grid_col
+                dirty_full = True
+            elif num_display_columns and current_grid_col >= first_visible_col + num_display_columns:
+                first_visible_col = current_grid_col - num_display_columns + 1
+                dirty_full = True
+
+            if needs_redraw: # Skipped after keys that change nothing on screen
+                footer_y_start = num_display_rows 
+                description_area_y_start = footer_y_start + 2
+                # The description only changes when the highlight moves, or after a full redraw
+                footer_dirty = dirty_full or prev_highlighted_linear_idx != highlighted_linear_idx
+
+                if dirty_full:
+                    # Display the menu in a grid layout, laid out column by column
+                    stdscr.erase()
+                    # Only the items in the visible columns are visited
+                    first_visible_idx = first_visible_col * num_display_rows
+                    last_visible_idx = min(first_visible_idx + num_display_columns * num_display_rows, num_apps)
+                    for idx in range(first_visible_idx, last_visible_idx):
+                        draw_cell(idx, idx == highlighted_linear_idx)
+
+                    # --- Footer ---
+                    instruction_line1 = "Arrows/PgUp/PgDn/Home/End. Space to toggle. Ctrl+A all."
+                    instruction_line2 = "'I' to install selected. 'Q' to quit."
                 
-                # Only draw if it's within the visible grid area
-                if display_row_for_item >= num_display_rows: # Item is too far down to fit in any column
-                    continue 
-
-                screen_x = display_col_for_item * option_width_on_screen
-                screen_y = display_row_for_item
+                    if footer_y_start < height:
+                         stdscr.addnstr(footer_y_start, 0, instruction_line1, width-1, bold_attr)
+                    if footer_y_start + 1 < height:
+                         stdscr.addnstr(footer_y_start + 1, 0, instruction_line2, width-1, bold_attr)
+                    dirty_full = False
+                elif prev_highlighted_linear_idx != highlighted_linear_idx:
+                    # Moving the highlight only changes the old and new cells
+                    draw_cell(prev_highlighted_linear_idx, False)
+                    draw_cell(highlighted_linear_idx, True)
+                prev_highlighted_linear_idx = highlighted_linear_idx
+
+                # --- Descriptions ---
+                if footer_dirty:
+                    # Blank the old description line by line rather than clearing the whole screen
+                    for clear_y in range(description_area_y_start, height):
+                        stdscr.move(clear_y, 0)
+                        stdscr.clrtoeol()
+                    current_app_name = app_names[highlighted_linear_idx]
+                
+                    if description_area_y_start < height:
+                        desc_header = f"Description of {current_app_name}:"
+                        stdscr.addnstr(description_area_y_start, 0, desc_header, width-1)
 
-                if screen_x + option_width_on_screen > width : # Item is in a column that's off screen
-                    continue
+                    for i, line_content in enumerate(app_desc_lines[highlighted_linear_idx]):
+                        current_print_y = description_area_y_start + 1 + i
+                        if current_print_y < height:
+                            stdscr.addnstr(current_print_y, 0, line_content, width-1)
+                        else:
+                            break
 
-
-                checkbox = "[X]" if checked_apps[app_name] else "[ ]"
-                display_string = f"{checkbox} {app_name}"
-                
-                # Truncate display_string to fit within the allocated column width
-                # -1 for safety with addstr
-                max_len_in_col = option_width_on_screen - 2 
-                display_string = display_string[:max_len_in_col]
-
-
-                if idx == highlighted_linear_idx:
-                    stdscr.attron(curses.color_pair(1))
-                    stdscr.addstr(screen_y, screen_x, display_string)
-                    stdscr.attroff(curses.color_pair(1))
-                else:
-                    stdscr.attron(curses.color_pair(2))
-                    stdscr.addstr(screen_y, screen_x, display_string)
-                    stdscr.attroff(curses.color_pair(2))
-            
-            # --- Footer and Descriptions ---
-            footer_y_start = num_display_rows 
-            
-            instruction_line1 = "Arrows/PgUp/PgDn/Home/End. Space to toggle. Ctrl+A all."
-            instruction_line2 = "'I' to install selected. 'Q' to quit."
-            
-            if footer_y_start < height:
-                 stdscr.addstr(footer_y_start, 0, instruction_line1[:width-1], curses.A_BOLD)
-            if footer_y_start + 1 < height:
-                 stdscr.addstr(footer_y_start + 1, 0, instruction_line2[:width-1], curses.A_BOLD)
-
-            description_area_y_start = footer_y_start + 2
-            if app_names and highlighted_linear_idx < len(app_names):
-                current_app_name = app_names[highlighted_linear_idx]
-                
-                if description_area_y_start < height:
-                    desc_header = f"Description of {current_app_name}:"
-                    stdscr.addstr(description_area_y_start, 0, desc_header[:width-1])
-
-                actual_desc_text = app_definitions.get(current_app_name, "No description available.")
-                if not isinstance(actual_desc_text, str): actual_desc_text = str(actual_desc_text)
-
-                desc_content_lines = actual_desc_text.split('\n')
-                for i, line_content in enumerate(desc_content_lines):
-                    current_print_y = description_area_y_start + 1 + i
-                    if current_print_y < height:
-                        stdscr.addstr(current_print_y, 0, line_content[:width-1])
-                    else:
-                        break
-            stdscr.refresh()
+                # Push all the changes to the terminal in one update
+                stdscr.noutrefresh()
+                curses.doupdate()
 
             # --- Handle user input ---
             key = stdscr.getch()
-            num_apps = len(app_names)
-            if not num_apps: continue # Should not happen if initial check is good
-
-            # Recalculate current linear index before navigation
-            # This is important if num_display_rows changed due to resize
-            # highlighted_linear_idx = current_grid_col * num_display_rows + current_grid_row
-            # highlighted_linear_idx = max(0, min(highlighted_linear_idx, num_apps - 1))
-
-
-            if key == curses.KEY_UP:
-                # highlighted_linear_idx = (current_grid_col * num_display_rows + current_grid_row - 1 + num_apps) % num_apps
-                new_row = current_grid_row - 1
-                if new_row >=0:
-                    highlighted_linear_idx = current_grid_col * num_display_rows + new_row
-                else: # wrap to bottom of previous column if not in first column
-                    if current_grid_col > 0:
-                        highlighted_linear_idx = (current_grid_col - 1) * num_display_rows + (num_display_rows -1)
-                        # Clamp if previous col was shorter
-                        highlighted_linear_idx = min(highlighted_linear_idx, num_apps -1)
-
-            elif key == curses.KEY_DOWN:
-                # highlighted_linear_idx = (current_grid_col * num_display_rows + current_grid_row + 1) % num_apps
-                new_row = current_grid_row + 1
-                potential_new_idx = current_grid_col * num_display_rows + new_row
-                if new_row < num_display_rows and potential_new_idx < num_apps :
-                    highlighted_linear_idx = potential_new_idx
-                else: # wrap to top of next column
-                    if (current_grid_col + 1) * num_display_rows < num_apps: # if next col exists
-                         highlighted_linear_idx = (current_grid_col + 1) * num_display_rows
-            
-            elif key == curses.KEY_LEFT:
-                if current_grid_col > 0:
-                    new_col = current_grid_col -1
-                    highlighted_linear_idx = new_col * num_display_rows + current_grid_row
-                     # If that row doesn't exist in new_col (e.g. last item of new_col)
-                    if highlighted_linear_idx >= (new_col +1) * num_display_rows and highlighted_linear_idx >=num_apps :
-                        highlighted_linear_idx = min(num_apps -1, (new_col +1) * num_display_rows -1 ) # last item in that col
-                    highlighted_linear_idx = min(highlighted_linear_idx, num_apps -1) # clamp
-
-            elif key == curses.KEY_RIGHT:
-                if (current_grid_col + 1) * num_display_rows < num_apps : # if there are items in the next column
-                    new_col = current_grid_col + 1
-                    highlighted_linear_idx = new_col * num_display_rows + current_grid_row
-                    # If that row doesn't exist in new_col (e.g. last item of new_col)
-                    # This can happen if the last column is not full.
-                    if highlighted_linear_idx >= num_apps:
-                         highlighted_linear_idx = num_apps -1 # Go to very last item
-                    highlighted_linear_idx = min(highlighted_linear_idx, num_apps -1) # clamp
-
-
-            elif key == curses.KEY_PPAGE:
-                highlighted_linear_idx = max(0, highlighted_linear_idx - num_display_rows)
-            elif key == curses.KEY_NPAGE:
-                highlighted_linear_idx = min(num_apps - 1, highlighted_linear_idx + num_display_rows)
-            elif key == curses.KEY_HOME:
-                highlighted_linear_idx = 0
-            elif key == curses.KEY_END:
-                highlighted_linear_idx = num_apps - 1
-            
-            elif key == ord(" "):
-                if num_apps > 0 and highlighted_linear_idx < num_apps:
-                    app_to_toggle = app_names[highlighted_linear_idx]
-                    checked_apps[app_to_toggle] = not checked_apps[app_to_toggle]
+            needs_redraw = True
+
+            nav_handler = nav_handlers.get(key)
+            if nav_handler is not None:
+                highlighted_linear_idx = nav_handler(highlighted_linear_idx)
+            elif key == key_space:
+                checked_flags[highlighted_linear_idx] ^= 1
+                draw_cell(highlighted_linear_idx, True) # Only the toggled cell changes
             elif key == 1:  # Ctrl+A
                 select_all_apps = not select_all_apps
-                for app_name_iter in app_names:
-                    checked_apps[app_name_iter] = select_all_apps
-            elif key == ord("i") or key == ord("I") or key == ord("x"):
-                selected_to_install = [app for app, is_checked in checked_apps.items() if is_checked]
+                checked_flags[:] = (b'\x01' if select_all_apps else b'\x00') * num_apps
+                dirty_full = True
+            elif key in install_keys:
+                selected_to_install = list(itertools.compress(app_names, checked_flags))
                 return selected_to_install
-            elif key == ord("q") or key == ord("Q"):
+            elif key in quit_keys:
                 return None
-            elif key == curses.KEY_RESIZE:
+            elif key == key_resize:
                 # Recalculate grid parameters in the next loop iteration
-                # Ensure highlighted_linear_idx stays valid
-                highlighted_linear_idx = max(0, min(highlighted_linear_idx, len(app_names) -1))
-                pass
-
-            # Ensure highlighted_linear_idx is always valid after navigation
-            if num_apps > 0:
-                 highlighted_linear_idx = max(0, min(highlighted_linear_idx, num_apps - 1))
-
+                dirty_full = True
+            else:
+                needs_redraw = False # Unbound key: nothing on screen changes
+                continue
 
         except curses.error as e:
             log_message(f"Curses error: {e}")
-            if "addwstr" in str(e) or "addstr" in str(e): pass
+            dirty_full = True # The screen may be half drawn, so start again from scratch
+            needs_redraw = True
+            if "addwstr" in str(e) or "addstr" in str(e) or "addnwstr" in str(e) or "addnstr" in str(e): pass
             else:
                 curses.endwin()
                 print(f"A curses error occurred: {e}. Check log at {LOG_FILE}")
@@ -297,6 +289,11 @@ def install_selected_apps(selected_apps):
         print("No applications were selected for installation.")
         return
 
+    if not shutil.which("apt-get"):
+        print("Error: apt-get was not found. This installer needs an apt-based system (Debian/Ubuntu).")
+        log_message("apt-get not found in PATH, nothing installed.")
+        return
+
     overall_start_time = time.time()
     app_start_times = {}
 
@@ -304,31 +301,35 @@ def install_selected_apps(selected_apps):
     print(f"Preparing to install {len(selected_apps)} application(s)...")
     print("-" * 40)
 
-    apps_string = " ".join(selected_apps)
-    install_command = INSTALL_COMMAND_TEMPLATE.format(packages=apps_string)
+    install_argv = INSTALL_COMMAND + list(selected_apps)
+    install_command = " ".join(install_argv) # For display and the log only
+    selected_repr = ", ".join(selected_apps) # Reused by every message below
     
-    start_time_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    start_time_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(overall_start_time))
     app_start_times["_batch_install_"] = start_time_str 
 
-    print(f"Starting: {start_time_str} - Installation of: {', '.join(selected_apps)}")
+    print(f"Starting: {start_time_str} - Installation of: {selected_repr}")
     print(f"Command: {install_command}")
     print("-" * 40)
     
     try:
-        process = subprocess.Popen(install_command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+        sys.stdout.flush() # Get the header above out before the raw output starts
+        process = subprocess.Popen(install_argv, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=OUTPUT_CHUNK_SIZE)
         
         if process.stdout:
-            for line in iter(process.stdout.readline, ''):
-                print(line, end='')
+            # read1 returns whatever is already in the pipe, so progress still shows up live
+            while chunk := process.stdout.read1(OUTPUT_CHUNK_SIZE):
+                sys.stdout.buffer.write(chunk)
+                sys.stdout.buffer.flush()
             process.stdout.close() 
         
         process.wait() 
         
         if process.returncode == 0:
-            print(f"\nSuccessfully processed: {', '.join(selected_apps)}")
+            print(f"\nSuccessfully processed: {selected_repr}")
             log_message(f"Successfully ran: {install_command}")
         else:
-            print(f"\nInstallation command failed with error code {process.returncode} for: {', '.join(selected_apps)}")
+            print(f"\nInstallation command failed with error code {process.returncode} for: {selected_repr}")
             log_message(f"Command failed (code {process.returncode}): {install_command}")
 
     except FileNotFoundError:
@@ -346,9 +347,9 @@ def install_selected_apps(selected_apps):
     print("-" * 40)
     print("Installation Summary:")
     for app_batch, start_t in app_start_times.items(): 
-        print(f"{start_t} - Attempted installation of: {', '.join(selected_apps)}")
+        print(f"{start_t} - Attempted installation of: {selected_repr}")
     
-    final_end_time_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    final_end_time_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(overall_end_time))
     print(f"{final_end_time_str} - Finished installation process.")
     total_runtime = overall_end_time - overall_start_time
     print(f"Total runtime for installation process: {total_runtime:.2f} seconds.")
@@ -365,18 +366,19 @@ def main():
             pass 
         print("\nProgram terminated by user (Ctrl+C).")
         log_message("Program terminated by SIGINT.")
+        _log_file.flush()
         sys.exit(0)
 
     signal.signal(signal.SIGINT, signal_handler)
 
     if not ESSENTIAL_APPS:
         print("No applications defined in ESSENTIAL_APPS. Nothing to do.")
-        log_message("ESSENTIAL_APPS dictionary is empty.")
+        log_message("ESSENTIAL_APPS is empty.")
         return
 
     selected_apps_to_install = []
     try:
-        selected_apps_to_install = curses.wrapper(display_menu, ESSENTIAL_APPS)
+        selected_apps_to_install = curses.wrapper(display_menu, APP_NAMES, APP_DESC_LINES)
     except curses.error as e: 
         print(f"A Curses error occurred: {e}. Check log for details at {LOG_FILE}.")
         log_message(f"Curses wrapper error: {e}")
@@ -396,8 +398,7 @@ def main():
         log_message("User proceeded to install but no apps were checked.")
     else:
         print("\nThe following applications will be installed:")
-        for app_name in selected_apps_to_install:
-            print(f"- {app_name}")
+        sys.stdout.write("".join(f"- {app_name}\n" for app_name in selected_apps_to_install))
         
         try:
             confirm = input("\nPress Enter to start installation, or type 'n' to cancel: ")
@@ -14,6 +14,10 @@ Example:
 """
 
 import argparse
+import base64
+import functools
+import hashlib
+import http.client
 import json
 import os
 import platform
@@ -23,11 +27,97 @@ import subprocess
 import sys
 import tarfile
 import tempfile
+import threading
 import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from urllib.error import HTTPError
-from urllib.parse import urlparse
-from urllib.request import Request, urlopen
+from urllib.parse import unquote, urljoin, urlparse, urlsplit
+from urllib.request import getproxies, proxy_bypass
+
+USER_AGENT = "GitHub-Project-Downloader/1.0"
+GITHUB_API_HEADERS = {"Accept": "application/vnd.github.v3+json"}
+
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "github-downloader"
+ETAG_CACHE_FILE = CACHE_DIR / "etags.json"
+INSTALLED_CACHE_FILE = CACHE_DIR / "installed.json"
+
+# Read size when copying downloads; larger chunks mean fewer Python-level read/write calls
+COPY_BUFSIZE = 1 << 20
+
+# Archives up to this size are buffered in memory when they can't be streamed
+SPOOL_MAX_SIZE = 64 << 20
+
+# One keep-alive connection per scheme and host (api.github.com, github.com, the
+# asset CDN), so the release lookups and the download reuse TLS sessions instead
+# of handshaking on every request.
+_connections = {}
+
+def _get_proxy(scheme, host):
+    """Return the split proxy URL from http_proxy/https_proxy for a host, or None if no_proxy excludes it."""
+    proxy = getproxies().get(scheme)
+    if not proxy or proxy_bypass(host):
+        return None
+    return urlsplit(proxy if "://" in proxy else "http://" + proxy)
+
+def _get_connection(scheme, host, fresh=False):
+    """Return the pooled connection for a scheme and host, creating it if needed.
+
+    When a proxy applies, the connection goes to the proxy and is tunnelled
+    through to the host with CONNECT.
+    """
+    key = (scheme, host)
+    conn = _connections.get(key)
+    if conn is None or fresh:
+        if conn is not None:
+            conn.close()
+        connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        proxy = _get_proxy(scheme, host)
+        if proxy:
+            conn = connection_class(proxy.hostname, proxy.port or 8080, timeout=30)
+            tunnel_headers = {}
+            if proxy.username:
+                credentials = f"{unquote(proxy.username)}:{unquote(proxy.password or '')}"
+                tunnel_headers["Proxy-Authorization"] = "Basic " + base64.b64encode(credentials.encode()).decode()
+            conn.set_tunnel(host, headers=tunnel_headers)
+        else:
+            conn = connection_class(host, timeout=30)
+        _connections[key] = conn
+    return conn
+
+def http_get(url, headers=None, max_redirects=5):
+    """GET a URL over a pooled connection, following redirects.
+
+    Every request carries our User-Agent. The caller must read the returned
+    response to the end before issuing another request to the same host.
+    """
+    headers = {"User-Agent": USER_AGENT, **(headers or {})}
+    for _ in range(max_redirects + 1):
+        parsed = urlparse(url)
+        scheme = parsed.scheme or "https"
+        path = parsed.path or "/"
+        if parsed.query:
+            path += "?" + parsed.query
+        conn = _get_connection(scheme, parsed.netloc)
+        try:
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+        except (http.client.HTTPException, ConnectionError):
+            # The server dropped the idle keep-alive socket; reconnect once
+            conn = _get_connection(scheme, parsed.netloc, fresh=True)
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+
+        if response.status in (301, 302, 303, 307, 308):
+            location = response.getheader("Location")
+            response.read()  # Drain the body so the connection can be reused
+            url = urljoin(url, location)
+            continue
+        if response.status >= 400:
+            response.read()
+            raise HTTPError(url, response.status, response.reason, response.headers, None)
+        return response
+    raise HTTPError(url, 310, "Too many redirects", None, None)
 
 def get_github_repo_info(url):
     """Extract the owner and repo name from a GitHub URL."""
@@ -41,177 +131,414 @@ def get_github_repo_info(url):
     
     return path_parts[0], path_parts[1]
 
-def create_github_api_request(endpoint):
-    """Create a request with appropriate GitHub API headers."""
-    headers = {
-        "Accept": "application/vnd.github.v3+json",
-        "User-Agent": "GitHub-Project-Downloader/1.0"
-    }
-    return Request(f"https://api.github.com/{endpoint}", headers=headers)
+def _load_json_cache(path):
+    """Load a JSON cache file, returning an empty dict if it is missing or corrupt."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_json_cache(path, data):
+    """Atomically write a JSON cache file; caching is best effort."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+_etag_cache = None
+
+def github_api_get(endpoint):
+    """Fetch and decode a GitHub API endpoint, revalidating any cached copy by ETag.
+
+    GitHub answers a matching If-None-Match with an empty 304, which does not
+    count against the rate limit.
+    """
+    global _etag_cache
+    if _etag_cache is None:
+        _etag_cache = _load_json_cache(ETAG_CACHE_FILE)
+    
+    headers = dict(GITHUB_API_HEADERS)
+    cached = _etag_cache.get(endpoint)
+    if cached:
+        headers["If-None-Match"] = cached["etag"]
+    
+    with http_get(f"https://api.github.com/{endpoint}", headers) as response:
+        body = response.read()
+        if response.status == 304 and cached:
+            return cached["body"]
+        etag = response.getheader("ETag")
+    
+    data = json.loads(body.decode('utf-8'))
+    if etag:
+        _etag_cache[endpoint] = {"etag": etag, "body": data}
+        _save_json_cache(ETAG_CACHE_FILE, _etag_cache)
+    return data
+
+# Returned by the API helpers when further API calls cannot find anything either
+NO_RELEASES = object()
+
+def _is_rate_limited(error):
+    """Check whether an HTTPError is GitHub refusing requests over the rate limit."""
+    return (error.code in (403, 429) and error.headers is not None
+            and error.headers.get("X-RateLimit-Remaining") == "0")
 
 def get_latest_release(owner, repo):
     """Get the latest release information from GitHub API."""
     try:
-        request = create_github_api_request(f"repos/{owner}/{repo}/releases/latest")
-        with urlopen(request) as response:
-            return json.loads(response.read().decode('utf-8'))
+        return github_api_get(f"repos/{owner}/{repo}/releases/latest")
     except HTTPError as e:
         if e.code == 404:
+            # /releases/latest ignores pre-releases, so the full list may still have some
             print(f"No releases found for {owner}/{repo} using GitHub API")
             return None
+        if _is_rate_limited(e):
+            print("GitHub API rate limit exceeded, skipping further API lookups")
+            return NO_RELEASES
         raise
 
 def get_all_releases(owner, repo):
-    """Get all releases information from GitHub API."""
+    """Get the most recent release (including pre-releases) from GitHub API."""
     try:
-        request = create_github_api_request(f"repos/{owner}/{repo}/releases")
-        with urlopen(request) as response:
-            return json.loads(response.read().decode('utf-8'))
+        return github_api_get(f"repos/{owner}/{repo}/releases?per_page=1")
     except HTTPError as e:
         if e.code == 404:
+            # The repo itself isn't visible to the API, so its tags won't be either
             print(f"No releases found for {owner}/{repo} using GitHub API")
-            return []
+            return NO_RELEASES
+        if _is_rate_limited(e):
+            print("GitHub API rate limit exceeded, skipping further API lookups")
+            return NO_RELEASES
         raise
 
 def get_latest_tag(owner, repo):
     """Get the latest tag information from GitHub API."""
     try:
-        request = create_github_api_request(f"repos/{owner}/{repo}/tags")
-        with urlopen(request) as response:
-            tags = json.loads(response.read().decode('utf-8'))
-            return tags[0] if tags else None
+        tags = github_api_get(f"repos/{owner}/{repo}/tags")
+        return tags[0] if tags else None
     except HTTPError:
         print(f"No tags found for {owner}/{repo}")
         return None
 
+@functools.lru_cache(maxsize=None)
+def _release_link_pattern(repo_path):
+    """Compile one pattern matching release tag/download links or data-tag attributes."""
+    return re.compile(
+        r'href="/' + re.escape(repo_path) + r'/releases/(?:tag|download)/([^"/]+)'
+        r'|data-tag="([^"]+)"'
+    )
+
 def get_latest_version_from_html(url):
     """Try to scrape the latest version from the GitHub repository page."""
     try:
-        request = Request(url, headers={"User-Agent": "GitHub-Project-Downloader/1.0"})
-        with urlopen(request) as response:
+        with http_get(url) as response:
             html = response.read().decode('utf-8')
             
             # Look for release links
-            release_patterns = [
-                r'href="/' + url.split('github.com/')[1] + r'/releases/tag/([^"]+)"',
-                r'href="/' + url.split('github.com/')[1] + r'/releases/download/([^/]+)',
-                r'data-tag="([^"]+)"'
-            ]
-            
-            for pattern in release_patterns:
-                matches = re.findall(pattern, html)
-                if matches:
-                    return matches[0]
+            match = _release_link_pattern(url.split('github.com/')[1].strip('/')).search(html)
+            if match:
+                return match.group(1) or match.group(2)
                     
             return None
     except Exception as e:
         print(f"Error scraping repository page: {e}")
         return None
 
+def iter_stream_matches(response, pattern, overlap=1024):
+    """Yield regex matches from a byte stream as it arrives, without buffering the whole body.
+
+    The last `overlap` bytes of each chunk are carried over so a match split
+    across two reads is still found; matches must be shorter than that.
+    """
+    buf = b''
+    while True:
+        chunk = response.read(65536)
+        if not chunk:
+            break
+        buf += chunk
+        keep_from = max(0, len(buf) - overlap)
+        for match in pattern.finditer(buf):
+            yield match
+            keep_from = max(keep_from, match.end())
+        buf = buf[keep_from:]
+
+# Substrings of platform.machine() mapped to our arch names; order matters,
+# e.g. "x86_64" must be tried before "x86" and "aarch64" before "arm"
+ARCH_MAP = (
+    ("x86_64", "x86_64"), ("amd64", "x86_64"),
+    ("aarch64", "arm64"), ("arm64", "arm64"),
+    ("arm", "arm"),
+    ("386", "386"), ("x86", "386"), ("i686", "386"),
+)
+
+@functools.lru_cache(maxsize=1)
 def determine_system_info():
     """Determine the current system's architecture and OS."""
-    system = platform.system().lower()
-    machine = platform.machine().lower()
-    
-    arch = None
-    if "x86_64" in machine or "amd64" in machine:
-        arch = "x86_64"
-    elif "aarch64" in machine or "arm64" in machine:
-        arch = "arm64"
-    elif "arm" in machine:
-        arch = "arm"
-    elif "386" in machine or "x86" in machine or "i686" in machine:
-        arch = "386"
-    else:
-        arch = machine
-    
+    uname = platform.uname()
+    system = uname.system.lower()
+    machine = uname.machine.lower()
+    arch = next((name for key, name in ARCH_MAP if key in machine), machine)
     return system, arch
 
+# Keywords that identify a release asset's target OS and architecture
+SYSTEM_KEYWORDS = {
+    "darwin": ("darwin", "mac", "macos", "osx", "apple"),
+    "windows": ("windows", "win"),
+}
+ARCH_KEYWORDS = {
+    "x86_64": ("x86_64", "amd64", "x64", "64"),
+    "arm64": ("arm64", "aarch64"),
+    "386": ("386", "i386", "x86", "32"),
+}
+
+# Common binary or archive formats worth considering
+ASSET_SUFFIXES = ('.zip', '.tar.gz', '.tgz', '.exe', '.dmg', '.deb', '.rpm')
+FALLBACK_ASSET_SUFFIXES = ('.zip', '.tar.gz', '.tgz', '.exe', '.dmg')
+
+@functools.lru_cache(maxsize=None)
+def _keyword_pattern(keywords):
+    """Compile a tuple of keywords into a single substring search."""
+    if not keywords:
+        return None
+    return re.compile('|'.join(map(re.escape, keywords)))
+
 def select_asset(assets, system, arch):
     """Select the most appropriate asset for the current system."""
-    # Create a prioritized list of keywords
-    system_keywords = [system]
-    if system == "darwin":
-        system_keywords.extend(["mac", "macos", "osx", "apple"])
-    elif system == "windows":
-        system_keywords.append("win")
-
-    arch_keywords = []
-    if arch == "x86_64":
-        arch_keywords.extend(["x86_64", "amd64", "x64", "64"])
-    elif arch == "arm64":
-        arch_keywords.extend(["arm64", "aarch64"])
-    elif arch == "386":
-        arch_keywords.extend(["386", "i386", "x86", "32"])
+    system_re = _keyword_pattern(SYSTEM_KEYWORDS.get(system, (system,)))
+    arch_re = _keyword_pattern(ARCH_KEYWORDS.get(arch, ()))
     
     # Score each asset based on filename
     best_asset = None
     best_score = -1
+    names = [asset["name"].lower() for asset in assets]
     
-    for asset in assets:
-        filename = asset["name"].lower()
-        score = 0
-        
+    for asset, filename in zip(assets, names):
         # Only consider common binary or archive formats
-        if not (filename.endswith('.zip') or 
-                filename.endswith('.tar.gz') or 
-                filename.endswith('.tgz') or 
-                filename.endswith('.exe') or 
-                filename.endswith('.dmg') or 
-                filename.endswith('.deb') or 
-                filename.endswith('.rpm')):
+        if not filename.endswith(ASSET_SUFFIXES):
             continue
             
         # Skip source code archives
         if "source" in filename or "src" in filename:
             continue
         
-        # Check for system match
-        for keyword in system_keywords:
-            if keyword in filename:
-                score += 10
-                break
-        
-        # Check for architecture match
-        for keyword in arch_keywords:
-            if keyword in filename:
-                score += 5
-                break
+        score = 0
+        if system_re and system_re.search(filename):
+            score += 10
+        if arch_re and arch_re.search(filename):
+            score += 5
         
         if score > best_score:
             best_score = score
             best_asset = asset
     
     # If no matching asset found but assets exist, take the first one that looks like a binary
-    if best_asset is None and assets:
-        for asset in assets:
-            filename = asset["name"].lower()
-            if (filename.endswith('.zip') or 
-                filename.endswith('.tar.gz') or 
-                filename.endswith('.tgz') or 
-                filename.endswith('.exe') or 
-                filename.endswith('.dmg')):
+    if best_asset is None:
+        for asset, filename in zip(assets, names):
+            if filename.endswith(FALLBACK_ASSET_SUFFIXES):
                 return asset
     
     return best_asset
 
 def download_file(url, dest_path):
     """Download a file from a URL to the specified path."""
-    request = Request(url, headers={"User-Agent": "GitHub-Project-Downloader/1.0"})
-    with urlopen(request) as response, open(dest_path, 'wb') as out_file:
-        shutil.copyfileobj(response, out_file)
+    with http_get(url) as response, open(dest_path, 'wb') as out_file:
+        shutil.copyfileobj(response, out_file, COPY_BUFSIZE)
     return dest_path
 
+SHA256_HEX_RE = re.compile(r'[0-9a-fA-F]{64}')
+
+def find_checksum_asset(assets, asset_name):
+    """Find a published SHA-256 checksum file that covers the given asset."""
+    by_name = {asset["name"].lower(): asset for asset in assets}
+    target = asset_name.lower()
+    for suffix in ('.sha256', '.sha256sum', '.sha256.txt'):
+        if target + suffix in by_name:
+            return by_name[target + suffix]
+    for name, asset in by_name.items():
+        if name.endswith(('sha256sums', 'sha256sums.txt', 'checksums.txt')):
+            return asset
+    return None
+
+def get_expected_sha256(assets, asset_name):
+    """Look up the release's published SHA-256 for an asset, or None if there isn't one."""
+    checksum_asset = find_checksum_asset(assets, asset_name)
+    if not checksum_asset:
+        return None
+    try:
+        with http_get(checksum_asset["browser_download_url"]) as response:
+            text = response.read().decode('utf-8', errors='replace')
+    except (HTTPError, OSError) as e:
+        print(f"Could not download checksum file {checksum_asset['name']}: {e}")
+        return None
+    
+    # Accept a bare hash, or "<hash>  [*]<file name>" lines as written by sha256sum
+    for line in text.splitlines():
+        fields = line.split()
+        if not fields or not SHA256_HEX_RE.fullmatch(fields[0]):
+            continue
+        if len(fields) == 1 or fields[-1].lstrip('*').rsplit('/', 1)[-1] == asset_name:
+            return fields[0].lower()
+    return None
+
+def file_sha256(path):
+    """Hash a file with SHA-256, using hashlib.file_digest where available."""
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+            return hashlib.file_digest(f, 'sha256')
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: f.read(COPY_BUFSIZE), b''):
+            digest.update(chunk)
+        return digest
+
+def verify_checksum(digest, expected_sha256, asset_name):
+    """Compare a computed digest with the published one, reporting the result."""
+    actual = digest.hexdigest()
+    if actual != expected_sha256:
+        print(f"Checksum mismatch for {asset_name}!")
+        print(f"  expected: {expected_sha256}")
+        print(f"  got:      {actual}")
+        return False
+    print("SHA-256 checksum verified.")
+    return True
+
+def _split_ext(name):
+    """Split a bare file name into (stem, extension); a leading dot is not an extension."""
+    dot = name.rfind('.')
+    if dot <= 0:
+        return name, ''
+    return name[:dot], name[dot:]
+
+# Extensions that never hold an installable binary (docs, sources, configs, images)
+NON_BINARY_EXTENSIONS = frozenset([
+    '.txt', '.md', '.rst', '.adoc', '.html', '.htm', '.css', '.pdf',
+    '.json', '.yml', '.yaml', '.toml', '.ini', '.cfg', '.conf', '.xml',
+    '.go', '.py', '.rs', '.c', '.h', '.cpp', '.hpp', '.rb', '.js', '.ts',
+    '.lock', '.sum', '.mod',
+    '.svg', '.png', '.jpg', '.jpeg', '.gif', '.ico',
+    '.gz', '.bash', '.zsh', '.fish', '.ps1',
+])
+
+# Below this much compressed data, starting worker processes costs more than it saves
+PARALLEL_UNZIP_MIN_BYTES = 16 << 20
+
+# Anything smaller than this is a script, stub or placeholder, not a real executable
+MIN_BINARY_SIZE = 1024
+
+def _likely_binary(name, size):
+    """Cheap check on an archive member's name and size before extracting it."""
+    if size < MIN_BINARY_SIZE:
+        return False
+    _, ext = _split_ext(name.rsplit('/', 1)[-1])
+    return ext.lower() not in NON_BINARY_EXTENSIONS
+
+def _extract_tar_binaries(tar_ref, extract_dir):
+    """Extract only the tar members that could be the executable we're after."""
+    for member in tar_ref:
+        if member.isfile() and _likely_binary(member.name, member.size):
+            tar_ref.extract(member, extract_dir)
+
+class _HashingReader:
+    """Read-only file wrapper that feeds every byte read into a hash object."""
+    
+    def __init__(self, fileobj, digest):
+        self._fileobj = fileobj
+        self._digest = digest
+    
+    def read(self, size=-1):
+        data = self._fileobj.read(size)
+        self._digest.update(data)
+        return data
+
+def _pump_to_pipe(source, write_fd, errors):
+    """Thread body: copy a download into a pipe for the extractor to read."""
+    try:
+        with os.fdopen(write_fd, 'wb', COPY_BUFSIZE) as sink:
+            shutil.copyfileobj(source, sink, COPY_BUFSIZE)
+    except Exception as e:
+        errors.append(e)
+
+def download_and_extract_tar(url, extract_dir, digest=None):
+    """Download a .tar.gz and extract it as it arrives, without saving the archive.
+
+    If digest is given, the downloaded bytes are hashed into it on the way through.
+    """
+    with http_get(url) as response:
+        source = _HashingReader(response, digest) if digest else response
+        if sys.version_info >= (3, 13):
+            # Download on a helper thread into a pipe, so inflating and writing
+            # files overlaps with receiving the rest of the archive
+            read_fd, write_fd = os.pipe()
+            errors = []
+            pump = threading.Thread(target=_pump_to_pipe, args=(source, write_fd, errors), daemon=True)
+            pump.start()
+            try:
+                with os.fdopen(read_fd, 'rb', COPY_BUFSIZE) as pipe_in:
+                    with tarfile.open(fileobj=pipe_in, mode='r|gz') as tar_ref:
+                        _extract_tar_binaries(tar_ref, extract_dir)
+                    # Drain any trailing padding so the download (and its hash) completes
+                    while pipe_in.read(COPY_BUFSIZE):
+                        pass
+            finally:
+                pump.join()
+            if errors:
+                raise errors[0]
+        else:
+            # Before 3.13 the r|gz stream reader re-slices its buffer on every read,
+            # which goes quadratic on highly compressed tarballs. Buffer the archive
+            # in memory instead (spilling to disk only if it is very large).
+            with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as spool:
+                shutil.copyfileobj(source, spool, COPY_BUFSIZE)
+                spool.seek(0)
+                with tarfile.open(fileobj=spool, mode='r:gz') as tar_ref:
+                    _extract_tar_binaries(tar_ref, extract_dir)
+    return None  # Return None to indicate we need to find binaries
+
+def _extract_zip_members(archive_path, names, extract_dir):
+    """Worker process: open the zip independently and extract the given members."""
+    with zipfile.ZipFile(archive_path, 'r') as zip_ref:
+        for name in names:
+            try:
+                zip_ref.extract(name, extract_dir)
+            except FileExistsError:
+                # Another worker created the same parent directory first
+                zip_ref.extract(name, extract_dir)
+
+def _extract_zip_parallel(archive_path, members, extract_dir):
+    """Inflate zip members across CPU cores, balancing the work by compressed size."""
+    workers = min(os.cpu_count() or 1, len(members))
+    batches = [[] for _ in range(workers)]
+    loads = [0] * workers
+    for info in sorted(members, key=lambda i: i.compress_size, reverse=True):
+        idx = loads.index(min(loads))
+        batches[idx].append(info.filename)
+        loads[idx] += info.compress_size
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_extract_zip_members, archive_path, batch, extract_dir)
+                   for batch in batches]
+        for future in futures:
+            future.result()  # Re-raise any worker error
+
 def extract_archive(archive_path, extract_dir):
     """Extract an archive file to the specified directory."""
     file_name = os.path.basename(archive_path).lower()
     
     if file_name.endswith('.zip'):
         with zipfile.ZipFile(archive_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_dir)
+            members = [info for info in zip_ref.infolist()
+                       if not info.is_dir() and _likely_binary(info.filename, info.file_size)]
+            if len(members) > 1 and sum(info.compress_size for info in members) >= PARALLEL_UNZIP_MIN_BYTES:
+                _extract_zip_parallel(archive_path, members, extract_dir)
+            else:
+                for info in members:
+                    zip_ref.extract(info, extract_dir)
     elif file_name.endswith('.tar.gz') or file_name.endswith('.tgz'):
         with tarfile.open(archive_path, 'r:gz') as tar_ref:
-            tar_ref.extractall(extract_dir)
+            _extract_tar_binaries(tar_ref, extract_dir)
     else:
         # If it's a standalone binary, just copy it
         dest_file = os.path.join(extract_dir, os.path.basename(archive_path))
@@ -221,36 +548,77 @@ def extract_archive(archive_path, extract_dir):
     
     return None  # Return None to indicate we need to find binaries
 
+def _walk_files(directory):
+    """Yield a DirEntry for every regular file under directory, skipping symlinks."""
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _walk_files(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+    except OSError:
+        # Unreadable directory, skip it like os.walk would
+        return
+
+# Executable headers: ELF, Mach-O fat, Mach-O 64-bit and Mach-O 32-bit
+EXECUTABLE_MAGIC = frozenset([
+    b'\x7fELF',
+    b'\xca\xfe\xba\xbe',
+    b'\xcf\xfa\xed\xfe',
+    b'\xce\xfa\xed\xfe',
+])
+
+# Below this many candidate files, sniffing them serially beats starting a thread pool
+PARALLEL_SNIFF_MIN_FILES = 32
+
+def _has_executable_magic(file_path):
+    """Check whether a file starts with a known executable header."""
+    try:
+        # Raw fd read avoids setting up a buffered file object for 4 bytes
+        fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0) | getattr(os, 'O_NOATIME', 0))
+    except PermissionError:
+        # O_NOATIME is refused on files we don't own
+        try:
+            fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        except OSError:
+            return False
+    except OSError:
+        return False
+    try:
+        header = os.read(fd, 4)
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+    return header[:2] == b'MZ' or header in EXECUTABLE_MAGIC  # MZ = Windows executable
+
 def find_binaries(directory):
     """Find potential binary files in the extracted directory."""
-    binaries = []
+    candidates = []
     
     # Extensions that are likely to be binaries on different platforms
     binary_extensions = set(['', '.exe'])
     
-    for root, _, files in os.walk(directory):
-        for file in files:
-            file_path = os.path.join(root, file)
-            
-            # Check if it's already executable or has a binary extension
-            _, ext = os.path.splitext(file)
-            if (os.access(file_path, os.X_OK) or ext in binary_extensions) and not os.path.islink(file_path):
-                try:
-                    # Additional check: try to determine if it's a binary file
-                    with open(file_path, 'rb') as f:
-                        header = f.read(4)
-                        # Check for common executable headers
-                        if (header.startswith(b'MZ') or  # Windows executable
-                            header.startswith(b'\x7fELF') or  # Linux executable
-                            header.startswith(b'\xca\xfe\xba\xbe') or  # Mach-O Fat Binary
-                            header.startswith(b'\xcf\xfa\xed\xfe') or  # Mach-O 64-bit
-                            header.startswith(b'\xce\xfa\xed\xfe')):  # Mach-O 32-bit
-                            binaries.append(file_path)
-                except:
-                    # If we can't read the file or it's too small, skip it
-                    pass
-    
-    return binaries
+    for entry in _walk_files(directory):
+        # Docs, sources and configs can't be binaries; skip them without a stat or open
+        _, ext = _split_ext(entry.name)
+        if ext.lower() in NON_BINARY_EXTENSIONS:
+            continue
+        
+        # Check if it's already executable or has a binary extension,
+        # and is big enough to hold an executable header
+        st = entry.stat(follow_symlinks=False)
+        if (st.st_mode & 0o111 or ext in binary_extensions) and st.st_size >= 4:
+            candidates.append(entry.path)
+    
+    # Header reads are tiny blocking syscalls that release the GIL, so threads
+    # overlap them well once there are enough candidates to be worth a pool
+    if len(candidates) >= PARALLEL_SNIFF_MIN_FILES:
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            found = executor.map(_has_executable_magic, candidates)
+            return [path for path, is_binary in zip(candidates, found) if is_binary]
+    return [path for path in candidates if _has_executable_magic(path)]
 
 def select_best_binary(binaries, repo_name):
     """Select the most likely binary to be the main executable."""
@@ -263,24 +631,22 @@ def select_best_binary(binaries, repo_name):
     
     # Try to find a binary with the same name as the repository
     repo_name_lower = repo_name.lower()
-    for binary in binaries:
-        binary_name = os.path.basename(binary).lower()
-        name_without_ext = os.path.splitext(binary_name)[0]
-        
-        if name_without_ext == repo_name_lower:
+    normalized = [b.replace('\\', '/') for b in binaries]
+    for binary, path in zip(binaries, normalized):
+        if _split_ext(path.rsplit('/', 1)[-1])[0].lower() == repo_name_lower:
             return binary
     
     # Look for binaries in a bin directory
-    bin_binaries = [b for b in binaries if '/bin/' in b.replace('\\', '/')]
-    if bin_binaries:
-        return bin_binaries[0]
+    for binary, path in zip(binaries, normalized):
+        if '/bin/' in path:
+            return binary
     
     # If we can't find a match, take the first binary
     return binaries[0]
 
 def install_binary(binary_path, repo_name):
     """Install the binary to an appropriate location."""
-    system = platform.system().lower()
+    system, _ = determine_system_info()
     
     if system == "windows":
         install_dir = os.path.join(os.environ.get('LOCALAPPDATA', os.path.expanduser('~')), 'Programs')
@@ -310,9 +676,33 @@ def install_binary(binary_path, repo_name):
     
     return dest_path
 
+def get_cached_install(owner, repo, system, arch, version, asset_url):
+    """Return where a previous run installed this exact release asset, if it is still there."""
+    entry = _load_json_cache(INSTALLED_CACHE_FILE).get(f"{owner}/{repo}")
+    if not entry:
+        return None
+    if (entry.get("version") == version and entry.get("asset") == asset_url
+            and entry.get("system") == system and entry.get("arch") == arch
+            and os.path.isfile(entry.get("installed_to", ""))):
+        return entry["installed_to"]
+    return None
+
+def record_install(owner, repo, system, arch, version, asset_url, install_path):
+    """Remember which release asset was installed where, for get_cached_install."""
+    cache = _load_json_cache(INSTALLED_CACHE_FILE)
+    cache[f"{owner}/{repo}"] = {
+        "version": version,
+        "asset": asset_url,
+        "system": system,
+        "arch": arch,
+        "installed_to": install_path,
+    }
+    _save_json_cache(INSTALLED_CACHE_FILE, cache)
+
 def main():
     parser = argparse.ArgumentParser(description="Download and install the latest release of a GitHub project")
     parser.add_argument("url", help="GitHub repository URL")
+    parser.add_argument("--force", action="store_true", help="Reinstall even if this release is already installed")
     args = parser.parse_args()
     
     # Extract owner and repo information
@@ -328,21 +718,21 @@ def main():
     latest_version = None
     assets = []
     
-    if latest_release:
+    if latest_release and latest_release is not NO_RELEASES:
         latest_version = latest_release["tag_name"]
         assets = latest_release["assets"]
         print(f"Found latest release: {latest_version}")
     else:
-        # Try getting all releases
-        releases = get_all_releases(owner, repo)
-        if releases:
+        # Try getting all releases, unless the API has already given up
+        releases = NO_RELEASES if latest_release is NO_RELEASES else get_all_releases(owner, repo)
+        if releases and releases is not NO_RELEASES:
             latest_release = releases[0]
             latest_version = latest_release["tag_name"]
             assets = latest_release["assets"]
             print(f"Found latest release: {latest_version}")
         else:
             # Try getting latest tag
-            latest_tag = get_latest_tag(owner, repo)
+            latest_tag = None if releases is NO_RELEASES else get_latest_tag(owner, repo)
             if latest_tag:
                 latest_version = latest_tag["name"]
                 print(f"Found latest tag: {latest_version}")
@@ -383,10 +773,9 @@ def main():
         # If we have a tag/version but no assets, try to construct a download URL
         release_url = f"https://github.com/{owner}/{repo}/releases/tag/{latest_version}"
         try:
-            request = Request(release_url, headers={"User-Agent": "GitHub-Project-Downloader/1.0"})
-            with urlopen(request) as response:
-                html = response.read().decode('utf-8')
-                download_links = re.findall(r'href="(/'+owner+'/'+repo+'/releases/download/[^"]+)"', html)
+            link_pattern = re.compile(rb'href="(/' + re.escape(f"{owner}/{repo}".encode()) + rb'/releases/download/[^"]+)"')
+            with http_get(release_url) as response:
+                download_links = [m.group(1).decode('utf-8') for m in iter_stream_matches(response, link_pattern)]
                 
                 if download_links:
                     assets = [{"name": link.split('/')[-1], 
@@ -401,19 +790,40 @@ def main():
         if best_asset:
             print(f"Selected asset: {best_asset['name']}")
             
+            # Nothing to do if this exact asset was installed by a previous run
+            installed_path = None if args.force else get_cached_install(
+                owner, repo, system, arch, latest_version, best_asset['browser_download_url'])
+            if installed_path:
+                print(f"{owner}/{repo} {latest_version} is already installed at {installed_path}")
+                print("Use --force to reinstall.")
+                return
+            
             # Create temporary directory for download and extraction
             with tempfile.TemporaryDirectory() as temp_dir:
-                # Download the asset
-                download_path = os.path.join(temp_dir, best_asset['name'])
-                print(f"Downloading to {download_path}...")
-                download_file(best_asset['browser_download_url'], download_path)
-                
-                # Extract the archive
-                print("Extracting archive...")
                 extract_dir = os.path.join(temp_dir, "extracted")
                 os.makedirs(extract_dir, exist_ok=True)
                 
-                extracted_files = extract_archive(download_path, extract_dir)
+                # Verify against the release's checksum file, if it publishes one
+                expected_sha256 = get_expected_sha256(assets, best_asset['name'])
+                
+                asset_name = best_asset['name'].lower()
+                if asset_name.endswith('.tar.gz') or asset_name.endswith('.tgz'):
+                    # Tarballs can be decompressed straight off the network
+                    print("Downloading and extracting archive...")
+                    digest = hashlib.sha256() if expected_sha256 else None
+                    extracted_files = download_and_extract_tar(best_asset['browser_download_url'], extract_dir, digest)
+                    if expected_sha256 and not verify_checksum(digest, expected_sha256, best_asset['name']):
+                        return
+                else:
+                    # Zips need random access to the central directory, so save them first
+                    download_path = os.path.join(temp_dir, best_asset['name'])
+                    print(f"Downloading to {download_path}...")
+                    download_file(best_asset['browser_download_url'], download_path)
+                    if expected_sha256 and not verify_checksum(file_sha256(download_path), expected_sha256, best_asset['name']):
+                        return
+                    
+                    print("Extracting archive...")
+                    extracted_files = extract_archive(download_path, extract_dir)
                 
                 # Find binaries if we extracted an archive
                 if not extracted_files:
@@ -433,6 +843,8 @@ def main():
                 
                 # Install the binary
                 install_path = install_binary(best_binary, repo)
+                record_install(owner, repo, system, arch, latest_version,
+                               best_asset['browser_download_url'], install_path)
                 print(f"\nSuccessfully installed {os.path.basename(install_path)} to {install_path}")
                 
                 # Add instructions for adding to PATH if it's not already there
@@ -6,142 +6,203 @@ import os
 import shutil
 import sys
 import argparse
+import json
 import re
+import shlex
 
 # Regex to match the SOURCE[/SUBPATH] format
 SUBPATH_SOURCE_RE = re.compile(r'^([^\[]+)\[([^\]]+)\]$')
 
+# Trailing partition number on an sdX/hdX device name (sda1 -> sda)
+PARTITION_NUMBER_RE = re.compile(r'\d+$')
+
+# Columns requested from findmnt when /proc/self/mountinfo can't be read
+FINDMNT_COLUMNS = "SOURCE,TARGET,FSTYPE,OPTIONS,FSROOT,MAJ:MIN"
+# KEY="value" pairs from `findmnt --pairs`, and the \xHH escapes used inside values
+FINDMNT_PAIR_RE = re.compile(r'([A-Z0-9_:%-]+)="((?:[^"\\]|\\.)*)"')
+FINDMNT_HEX_ESCAPE_RE = re.compile(r'\\x([0-9a-fA-F]{2})')
+
+# Octal escapes the kernel uses for spaces, tabs, newlines and backslashes in mountinfo
+MOUNTINFO_ESCAPE_RE = re.compile(r'\\([0-7]{3})')
+
 def run_command(command):
-    """Runs a shell command and returns its output or None on error."""
+    """Runs a command (argv list, no shell) and returns its output or None on error."""
     try:
         result = subprocess.run(
             command,
             capture_output=True,
             text=True,
             # check=True, # Don't raise error immediately, we'll check stderr for 'unknown column'
-            shell=True
         )
         # Check for known errors like 'unknown column'
         if result.returncode != 0 and "unknown column" in result.stderr.lower():
              return None
         elif result.returncode != 0:
-             print(f"Error executing command: {command}", file=sys.stderr)
+             print(f"Error executing command: {' '.join(command)}", file=sys.stderr)
              print(f"Stderr: {result.stderr.strip()}", file=sys.stderr)
              return None
 
         return result.stdout.strip()
     except FileNotFoundError:
-        print(f"Command not found. Make sure '{command.split()[0]}' is in your PATH.", file=sys.stderr)
+        print(f"Command not found. Make sure '{command[0]}' is in your PATH.", file=sys.stderr)
         return None
     except Exception as e:
         print(f"An unexpected error occurred running command: {e}", file=sys.stderr)
         return None
 
 
-def parse_mount_output(output, include_sourcepath=False):
-    """Parses the output of findmnt, optionally including SOURCEPATH."""
-    mounts = []
-    if not output:
-        return mounts
+def _unescape_mountinfo(field):
+    """Decodes the octal escapes (e.g. \\040 for a space) in a mountinfo field."""
+    return MOUNTINFO_ESCAPE_RE.sub(lambda m: chr(int(m.group(1), 8)), field)
 
-    lines = output.splitlines()
-    if not lines or len(lines) < 2:
-        return mounts
 
-    header = lines[0].split()
-    data_lines = lines[1:]
+def parse_mountinfo(mountinfo_path='/proc/self/mountinfo', skip_fstypes=frozenset()):
+    """Parses the kernel mount table directly, returning None if it can't be read.
 
-    # Find column indices
+    Each line is: ID PARENT MAJ:MIN ROOT TARGET OPTIONS [OPTIONAL...] - FSTYPE SOURCE SUPER_OPTIONS
+    where ROOT is the directory of the filesystem that is mounted at TARGET.
+    Whole-filesystem mounts of a type in skip_fstypes are dropped before any
+    further parsing; sub-directory mounts of those types are still returned.
+    Returns (mounts, dropped_targets), where dropped_targets lists the targets
+    of the dropped mounts so they can still be counted.
+    """
     try:
-        source_idx = header.index('SOURCE')
-        target_idx = header.index('TARGET')
-        fstype_idx = header.index('FSTYPE')
-        options_idx = header.index('OPTIONS')
-        sourcepath_idx = header.index('SOURCEPATH') if include_sourcepath and 'SOURCEPATH' in header else -1
-    except ValueError as e:
-        print(f"Error parsing findmnt header: {e}", file=sys.stderr)
-        print("Please ensure findmnt output contains SOURCE, TARGET, FSTYPE, and OPTIONS columns.", file=sys.stderr)
-        return []
-
-
-    for line in data_lines:
-        # Attempt to split line by spaces, being aware of paths/sources with spaces
-        # This is a potential source of parsing issues for paths with spaces not quoted by findmnt -l
-        parts = line.split()
-
-        # --- Basic parsing assuming order ---
-        if len(parts) < 4: continue # Need at least SOURCE, TARGET, FSTYPE, OPTIONS
-
-        # --- Attempt to locate TARGET, FSTYPE, OPTIONS, SOURCE ---
-        # We can try to locate known fields from the right, assuming TARGET is first,
-        # then some fields, then OPTIONS, FSTYPE, SOURCE (potentially with spaces)
-        # This is still fragile. Let's stick to simple split and acknowledge limitations with spaced paths.
-        # The logic below uses simple split assuming SOURCE, TARGET, FSTYPE, OPTIONS are first fields.
-        # This will fail if SOURCE or TARGET have spaces UNLESS findmnt quotes them (which -l doesn't reliably do).
-        # The best parsing for -l is complex and involves column widths, which is beyond this scope.
-        # We proceed with simple split, accepting that sources/targets with spaces might be misparsed.
-
-        if include_sourcepath and sourcepath_idx != -1:
-             # If SOURCEPATH is present, try parsing including it
-             # This split needs to be smarter to handle potential spaces in SOURCE or TARGET before SOURCEPATH
-             # Let's skip robust parsing here for now and rely on the simpler case working or filtering.
-             # For now, if SOURCEPATH is available, assume basic parsing works OR that SOURCEPATH itself is correct.
-             if len(parts) > sourcepath_idx:
-                  source = " ".join(parts[:source_idx+1]) # Simple guess - source might be multiple words
-                  target = " ".join(parts[source_idx+1:target_idx+1]) # Simple guess
-                  fstype = parts[fstype_idx] # Likely correct
-                  options = parts[options_idx].strip('[]') # Likely correct
-                  source_path_val = " ".join(parts[sourcepath_idx:]) # SourcePath might be multiple words
-             else:
-                  continue # Skip malformed line
-        else:
-             # Standard case without SOURCEPATH
-             if len(parts) >= 4:
-                  source = parts[0]
-                  target = parts[1]
-                  fstype = parts[2]
-                  options = parts[3].strip('[]')
-                  source_path_val = None
-             else:
-                  continue # Skip malformed line
-
-
-        mount_info = {
-           'source': source,
-           'target': target,
-           'fstype': fstype,
-           'options': options,
-           'source_path': source_path_val
-       }
-
-        # Check if the source is in the DEVICE[/SUBPATH] format
-        match = SUBPATH_SOURCE_RE.match(mount_info['source'])
+        with open(mountinfo_path, 'r') as f:
+            lines = f.read().splitlines()
+    except OSError as e:
+        print(f"Could not read {mountinfo_path}: {e}", file=sys.stderr)
+        return None
+
+    entries = []
+    hidden_roots = {} # MAJ:MIN -> target, for skipped mounts that bind mounts may point into
+    dropped_targets = []
+    for line in lines:
+        # The number of optional fields varies, so split either side of the ' - '
+        # separator, and only as far as the fields we use
+        head, sep, tail = line.partition(' - ')
+        head_fields = head.split(' ', 6)
+        tail_fields = tail.split(' ', 2)
+        if not sep or len(head_fields) < 6 or len(tail_fields) < 3:
+            continue # Malformed line
+        _, _, dev_id, root, target, mount_options = head_fields[:6]
+        fstype, source, super_options = tail_fields
+        if root == '/' and fstype in skip_fstypes:
+            target = _unescape_mountinfo(target)
+            hidden_roots.setdefault(dev_id, target)
+            dropped_targets.append(target)
+            continue
+
+        entries.append((dev_id, _unescape_mountinfo(root), {
+            'source': _unescape_mountinfo(source),
+            'target': _unescape_mountinfo(target),
+            'fstype': fstype,
+            # Like findmnt's OPTIONS: per-mount options followed by filesystem options
+            'options': dedup_options(f"{mount_options},{super_options}"),
+        }))
+
+    return _resolve_subpath_mounts(entries, hidden_roots), dropped_targets
+
+
+_findmnt_json_supported = None
+
+def findmnt_supports_json():
+    """Checks once whether findmnt is new enough (util-linux 2.27+) for --json."""
+    global _findmnt_json_supported
+    if _findmnt_json_supported is None:
+        version_output = run_command(["findmnt", "--version"]) or ""
+        match = re.search(r'(\d+)\.(\d+)', version_output)
+        # Assume a modern findmnt if the version string is unrecognisable
+        _findmnt_json_supported = not match or (int(match.group(1)), int(match.group(2))) >= (2, 27)
+    return _findmnt_json_supported
+
+
+def get_findmnt_mounts(skip_fstypes=frozenset()):
+    """Gets the mount table from findmnt, for systems where /proc isn't available.
+
+    skip_fstypes and the return value work as in parse_mountinfo.
+    """
+    if findmnt_supports_json():
+        output = run_command(["findmnt", "--json", "--list", "--output", FINDMNT_COLUMNS])
+        if output is None:
+            return None
+        rows = json.loads(output).get('filesystems', [])
+    else:
+        # util-linux before 2.27 has no --json; --pairs prints KEY="value" pairs instead
+        output = run_command(["findmnt", "--pairs", "--output", FINDMNT_COLUMNS])
+        if output is None:
+            return None
+        rows = [parse_findmnt_pairs(line) for line in output.splitlines()]
+
+    entries = []
+    hidden_roots = {}
+    dropped_targets = []
+    for row in rows:
+        dev_id = row.get('maj:min') or row.get('maj_min')
+        fs_root = row.get('fsroot') or '/'
+        if fs_root == '/' and row.get('fstype') in skip_fstypes:
+            target = row.get('target') or ''
+            hidden_roots.setdefault(dev_id, target)
+            dropped_targets.append(target)
+            continue
+        source = row.get('source') or ''
+        # Bind mounts show up as DEVICE[/SUBPATH]; FSROOT carries the same subpath
+        match = SUBPATH_SOURCE_RE.match(source)
         if match:
-            mount_info['underlying_device'] = match.group(1)
-            mount_info['subpath_on_device'] = match.group(2)
+            source = match.group(1)
+        entries.append((dev_id, fs_root, {
+            'source': source,
+            'target': row.get('target') or '',
+            'fstype': row.get('fstype') or '',
+            'options': row.get('options') or '',
+        }))
+    return _resolve_subpath_mounts(entries, hidden_roots), dropped_targets
+
+
+def parse_findmnt_pairs(line):
+    """Parses one line of `findmnt --pairs` output into a dict with lowercase keys."""
+    return {key.lower(): FINDMNT_HEX_ESCAPE_RE.sub(lambda m: chr(int(m.group(1), 16)), value)
+            for key, value in FINDMNT_PAIR_RE.findall(line)}
+
+
+def _resolve_subpath_mounts(entries, hidden_roots=None):
+    """Builds mount dicts from (dev_id, fs_root, mount_info) tuples.
+
+    A filesystem root other than '/' means a bind/subpath mount; the same
+    device's '/' mount tells us where that directory can be found. hidden_roots
+    holds the '/' mounts that were filtered out of entries.
+    """
+    device_roots = dict(hidden_roots or {}) # MAJ:MIN -> where that filesystem's root directory is mounted
+    for dev_id, root, mount_info in entries:
+        if root == '/':
+            device_roots.setdefault(dev_id, mount_info['target'])
+
+    mounts = []
+    for dev_id, root, mount_info in entries:
+        mount_info['source_path'] = None
+        if root != '/':
+            mount_info['underlying_device'] = mount_info['source']
+            mount_info['subpath_on_device'] = root
             mount_info['is_subpath_mount'] = True
+            device_mount = device_roots.get(dev_id)
+            if device_mount:
+                mount_info['source_path'] = os.path.join(device_mount, root.lstrip('/'))
         else:
             mount_info['is_subpath_mount'] = False
-
         mounts.append(mount_info)
 
     return mounts
 
 
 def parse_fstab():
-    """Parses the /etc/fstab file."""
-    fstab_entries = {}
+    """Parses the /etc/fstab file, returning the set of mount targets it defines."""
     fstab_path = '/etc/fstab'
     try:
         with open(fstab_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
-                parts = line.split()
-                if len(parts) >= 2:
-                    target = parts[1]
-                    fstab_entries[target] = line
+            # Only the target (2nd field) is needed, so stop splitting after it
+            fields = (line.split(None, 2) for line in f)
+            # fstab uses the same \040 escapes as mountinfo
+            fstab_entries = {_unescape_mountinfo(parts[1]) for parts in fields
+                             if len(parts) >= 2 and not parts[0].startswith('#')}
     except FileNotFoundError:
         print(f"{fstab_path} not found. This script is intended for Linux-like systems.", file=sys.stderr)
         return None
@@ -150,203 +211,235 @@ def parse_fstab():
         return None
     return fstab_entries
 
+# Mount targets that are system/internal locations
+SYSTEM_MOUNT_PREFIXES = (
+    '/proc', '/sys', '/dev', '/run', '/snap',
+    '/var/lib/docker',
+    '/lost+found',
+    '/init', # WSL specific init mount
+    '/mnt/wsl', # WSL internal mounts (docker-desktop, etc.)
+    '/mnt/wslg', # WSLg (GUI) mounts
+    '/tmp/.X11-unix' # Standard X11 socket location (often tmpfs or bind)
+)
+
 def is_system_mount_target(mount_target):
     """Checks if a mount target path is likely a system/internal mount location."""
-    if mount_target == '/':
-        return True # Root is definitely system
-
-    system_prefixes = [
-        '/proc', '/sys', '/dev', '/run', '/snap',
-        '/var/lib/docker',
-        '/lost+found',
-        '/init', # WSL specific init mount
-        '/mnt/wsl', # WSL internal mounts (docker-desktop, etc.)
-        '/mnt/wslg', # WSLg (GUI) mounts
-        '/tmp/.X11-unix' # Standard X11 socket location (often tmpfs or bind)
-    ]
-    for prefix in system_prefixes:
-        if mount_target.startswith(prefix):
-            return True
-    return False
+    # Root is definitely system; str.startswith tests every prefix in one call
+    return mount_target == '/' or mount_target.startswith(SYSTEM_MOUNT_PREFIXES)
+
 
+# Filesystem types that are typically dynamic or pseudo
+DYNAMIC_FSTYPES = frozenset([
+    'proc', 'sysfs', 'devtmpfs', 'tmpfs', 'cgroup2', 'securityfs', 'pstore',
+    'bpf', 'debugfs', 'tracefs', 'configfs', 'fusectl', 'mqueue',
+    'hugetlbfs', 'rpc_pipefs', 'nsfs', 'fuse.gvfsd-fuse', 'autofs', 'nfsd',
+    'overlay', 'squashfs',
+    '9p', # WSL Windows drive mounts and some internal mounts
+    'iso9660', # Often temporary CD/ISO mounts like for docker cli tools
+    '/Docker/host' # Specific Docker Desktop mount fstype? (May vary)
+])
+
+# Regular on-disk filesystems that get the standard option handling
+STANDARD_FSTYPES = frozenset(['ext4', 'xfs', 'vfat', 'ntfs', 'ntfs3', 'fuseblk'])
 
 def is_dynamic_or_pseudo_filesystem_type(fstype):
     """Checks if a filesystem type is typically dynamic or pseudo."""
-    dynamic_fstypes = [
-        'proc', 'sysfs', 'devtmpfs', 'tmpfs', 'cgroup2', 'securityfs', 'pstore',
-        'bpf', 'debugfs', 'tracefs', 'configfs', 'fusectl', 'mqueue',
-        'hugetlbfs', 'rpc_pipefs', 'nsfs', 'fuse.gvfsd-fuse', 'autofs', 'nfsd',
-        'overlay', 'squashfs',
-        '9p', # WSL Windows drive mounts and some internal mounts
-        'iso9660', # Often temporary CD/ISO mounts like for docker cli tools
-        '/Docker/host' # Specific Docker Desktop mount fstype? (May vary)
-    ]
-    if fstype == 'none': # Keep none as potentially user-created bind mount
-        return False
-    return fstype in dynamic_fstypes
+    # 'none' is not in the set, so potential user-created bind mounts are kept
+    return fstype in DYNAMIC_FSTYPES
 
 
-def generate_fstab_line(mount_info):
-    """Generates a potential fstab line based on mount info."""
+def split_options(options):
+    """Splits a comma-separated option string into a list, dropping duplicates and empty entries."""
+    return list(dict.fromkeys(opt for opt in options.split(',') if opt))
+
+
+def dedup_options(options):
+    """Drops duplicate and empty entries from a comma-separated option string, keeping order."""
+    return ",".join(split_options(options))
+
+
+def _handle_subpath_mount(mount_info, **_):
+    """Builds the fstab fields for a sub-directory (bind) mount."""
     source = mount_info['source']
-    target = mount_info['target']
-    fstype = mount_info['fstype']
     options = mount_info['options']
-    is_subpath_mount = mount_info.get('is_subpath_mount', False)
     underlying_device = mount_info.get('underlying_device')
     subpath_on_device = mount_info.get('subpath_on_device')
-    source_path = mount_info.get('source_path') # SOURCEPATH from findmnt (if available)
+    source_path = mount_info.get('source_path') # Where the subpath is visible, if known
+
+    notes = ["Detected as a sub-directory mount."]
+    # Use source_path if available (resolved from the mount table)
+    if source_path:
+        fstab_source = source_path
+        notes.append(f"  Source path resolved from the mount table: {fstab_source}")
+    # Construct the assumed source path from DEVICE[/SUBPATH]
+    elif underlying_device and subpath_on_device:
+        # Assume the underlying device is mounted at /mnt/<device_name>
+        # Handle devices like /dev/sdb1, /dev/sda, /dev/loop0 etc.
+        # Strip /dev/ prefix
+        device_base_name = underlying_device.replace('/dev/', '')
+        # Attempt to remove partition numbers but keep loopX, etc.
+        device_short_name = device_base_name
+        if device_short_name.startswith(('sd', 'hd')):
+            device_short_name = PARTITION_NUMBER_RE.sub('', device_short_name) # Remove trailing digits (sda1 -> sda)
+
+        # Special case for /mnt/none seen in WSLg binds - use the source part directly
+        if underlying_device == '/mnt/none':
+            fstab_source = subpath_on_device # e.g., /etc/versions.txt or .X11-unix
+            notes.append("  Source path derived from /mnt/none[/SUBPATH] format.")
+        else:
+            # Combine /mnt/, device short name, and subpath
+            fstab_source = f"/mnt/{device_short_name}/{subpath_on_device.lstrip('/')}"
+            notes.append(f"  Source path assumed from DEVICE[/SUBPATH] format: {fstab_source}")
+            notes.append("  NOTE: This assumed path might be incorrect if the underlying device is not mounted at /mnt/<device_name>.")
+    else:
+        notes.append("  WARNING: Could not fully parse subpath source. Using original source string.")
+        fstab_source = source
 
+    opts_list = split_options(options)
+    # Ensure 'bind' option is present
+    if 'bind' not in opts_list:
+        opts_list.append('bind')
 
-    # Determine if nofail should be added based on user's general logic
-    should_add_nofail = (target != '/')
+    # Add defaults if options are minimal (excluding 'bind')
+    if set(opts_list) - {'bind'} <= {'rw', 'relatime'} and 'defaults' not in opts_list:
+        opts_list.append('defaults')
 
-    fstab_source = source
-    fstab_fstype = fstype
-    fstab_options = options
+    # Bind/subpath mounts in fstab typically use 'none' fstype
+    return fstab_source, 'none', opts_list, notes
 
-    notes = [] # List to store notes about this generated line
 
-    # --- Handle Subpath Mounts (often bind mounts) ---
-    if is_subpath_mount:
-        notes.append("Detected as a sub-directory mount.")
-        # Use source_path if available (from SOURCEPATH column)
-        if source_path:
-             fstab_source = source_path
-             notes.append(f"  Source path derived from findmnt SOURCEPATH: {fstab_source}")
-        else:
-             # Construct the assumed source path from DEVICE[/SUBPATH]
-             if underlying_device and subpath_on_device:
-                 # Assume the underlying device is mounted at /mnt/<device_name>
-                 # Handle devices like /dev/sdb1, /dev/sda, /dev/loop0 etc.
-                 # Strip /dev/ prefix
-                 device_base_name = underlying_device.replace('/dev/', '')
-                 # Attempt to remove partition numbers but keep loopX, etc.
-                 device_short_name = device_base_name
-                 if device_short_name.startswith('sd') or device_short_name.startswith('hd'):
-                     device_short_name = re.sub(r'\d+$', '', device_short_name) # Remove trailing digits (sda1 -> sda)
-                     device_short_name = re.sub(r'p\d+$', '', device_short_name) # Remove pX like sda1p1 -> sda1
-
-                 # Special case for /mnt/none seen in WSLg binds - use the source part directly
-                 if underlying_device == '/mnt/none':
-                      assumed_source = subpath_on_device # e.g., /etc/versions.txt or .X11-unix
-                      notes.append("  Source path derived from /mnt/none[/SUBPATH] format.")
-                 else:
-                     # Combine /mnt/, device short name, and subpath
-                     assumed_source = f"/mnt/{device_short_name}/{subpath_on_device.lstrip('/')}"
-                     notes.append(f"  Source path assumed from DEVICE[/SUBPATH] format: {assumed_source}")
-                     notes.append("  NOTE: This assumed path might be incorrect if the underlying device is not mounted at /mnt/<device_name>.")
-
-
-                 fstab_source = assumed_source
-             else:
-                 notes.append("  WARNING: Could not fully parse subpath source. Using original source string.")
-                 fstab_source = source
-
-
-        fstab_fstype = 'none' # Bind/subpath mounts in fstab typically use 'none' fstype
-        # Ensure 'bind' option is present
-        if 'bind' not in fstab_options.split(','):
-            fstab_options = f"{fstab_options},bind" if fstab_options else "bind"
-
-        # Add defaults if options are minimal (excluding 'bind')
-        current_options_list = fstab_options.split(',')
-        options_without_bind = [opt for opt in current_options_list if opt != 'bind']
-        if not options_without_bind or set(options_without_bind).issubset({'rw', 'relatime'}):
-             if 'defaults' not in current_options_list:
-                 fstab_options = f"{fstab_options},defaults" if fstab_options else "defaults"
-        # Clean up duplicates potentially created by adding defaults
-        fstab_options = ",".join(sorted(list(set(fstab_options.split(',')))))
-
-
-    # --- Special handling for CIFS (SMB) ---
-    elif fstype == 'cifs':
-        notes.append("Detected as an SMB/CIFS mount.")
+def _handle_cifs_mount(mount_info, credentials=None, interactive=True):
+    """Builds the fstab fields for an SMB/CIFS mount.
+
+    credentials is this mount's entry from --creds-json, either {"file": PATH}
+    or {"username": ..., "password": ...}. Without it the user is prompted,
+    unless interactive is False, in which case the mount is skipped.
+    """
+    target = mount_info['target']
+    notes = ["Detected as an SMB/CIFS mount."]
+    cred_path = username = password = ''
+    if credentials:
+        cred_path = credentials.get('file', '').strip()
+        username = credentials.get('username', '').strip()
+        password = credentials.get('password', '').strip()
+        cred_choice = 'file' if cred_path else 'direct'
+        print(f"Using credentials for {target} from the credentials JSON file.")
+    elif not interactive:
+        print(f"No credentials given for SMB/CIFS mount {target}. Skipping fstab line.", file=sys.stderr)
+        return None
+    else:
         print("This is an SMB/CIFS mount. Credentials are required for the fstab entry.")
         cred_choice = input("Use a credentials file (recommended) or enter directly? [file/direct/cancel]: ").lower()
-
-        creds_options = ""
         if cred_choice == 'file':
             cred_path = input("Enter the full path to the credentials file (e.g., /home/user/.smbcredentials): ").strip()
-            if not cred_path:
-                print("Credentials file path cannot be empty. Skipping this mount.", file=sys.stderr)
-                return None, []
-            print(f"Remember to set strict permissions on your credentials file: chmod 600 {cred_path}")
-            creds_options = f",credentials={cred_path}"
-            notes.append(f"  Requires credentials file: {cred_path}")
         elif cred_choice == 'direct':
             username = input("Enter username: ").strip()
             password = input("Enter password: ").strip()
-            if not username or not password:
-                 print("Username and password cannot be empty. Skipping this mount.", file=sys.stderr)
-                 return None, []
-            print("Warning: Storing passwords directly in fstab is insecure. Consider using a credentials file.", file=sys.stderr)
-            creds_options = f",username={username},password={password}"
-            notes.append("  Includes username/password directly (less secure).")
-        elif cred_choice == 'cancel':
-            print("Cancelled credential input for this mount. Skipping fstab line.", file=sys.stderr)
-            return None, []
-        else:
-            print("Invalid choice for credentials. Skipping fstab line.", file=sys.stderr)
-            return None, []
 
-        fstab_options = f"{fstab_options}{creds_options}"
+    creds_options = []
+    if cred_choice == 'file':
+        if not cred_path:
+            print("Credentials file path cannot be empty. Skipping this mount.", file=sys.stderr)
+            return None
+        print(f"Remember to set strict permissions on your credentials file: chmod 600 {cred_path}")
+        creds_options = [f"credentials={cred_path}"]
+        notes.append(f"  Requires credentials file: {cred_path}")
+    elif cred_choice == 'direct':
+        if not username or not password:
+            print("Username and password cannot be empty. Skipping this mount.", file=sys.stderr)
+            return None
+        print("Warning: Storing passwords directly in fstab is insecure. Consider using a credentials file.", file=sys.stderr)
+        creds_options = [f"username={username}", f"password={password}"]
+        notes.append("  Includes username/password directly (less secure).")
+    elif cred_choice == 'cancel':
+        print("Cancelled credential input for this mount. Skipping fstab line.", file=sys.stderr)
+        return None
+    else:
+        print("Invalid choice for credentials. Skipping fstab line.", file=sys.stderr)
+        return None
+
+    opts_list = split_options(mount_info['options'])
+    opts_list.extend(opt for opt in creds_options if opt not in opts_list)
+
+    if set(opts_list) <= {'rw', 'relatime', 'errors=remount-ro'} and 'defaults' not in opts_list:
+        opts_list.append('defaults')
 
-        current_options_list = fstab_options.split(',')
-        if not fstab_options or set(current_options_list).issubset({'rw', 'relatime', 'errors=remount-ro'}):
-             if 'defaults' not in current_options_list:
-                 fstab_options = f"{fstab_options},defaults" if fstab_options else "defaults"
-        fstab_options = ",".join(sorted(list(set(fstab_options.split(',')))))
-        if should_add_nofail and 'nofail' not in fstab_options.split(','):
-            fstab_options = f"{fstab_options},nofail"
+    return mount_info['source'], 'cifs', opts_list, notes
 
 
-    # --- Handling other standard filesystems (ext4, vfat, etc.) ---
-    elif fstype in ['ext4', 'xfs', 'vfat', 'ntfs', 'ntfs3', 'fuseblk']:
-        notes.append(f"Detected as a standard {fstype} mount.")
-        current_options_list = fstab_options.split(',')
-        if not fstab_options or set(current_options_list).issubset({'rw', 'relatime', 'errors=remount-ro'}):
-             if 'defaults' not in current_options_list:
-                 fstab_options = f"{fstab_options},defaults" if fstab_options else "defaults"
-        fstab_options = ",".join(sorted(list(set(fstab_options.split(',')))))
+def _handle_standard_mount(mount_info, **_):
+    """Builds the fstab fields for a regular on-disk filesystem (ext4, vfat, etc.)."""
+    fstype = mount_info['fstype']
+    opts_list = split_options(mount_info['options'])
+    notes = [f"Detected as a standard {fstype} mount."]
+    if set(opts_list) <= {'rw', 'relatime', 'errors=remount-ro'} and 'defaults' not in opts_list:
+        opts_list.append('defaults')
+    return mount_info['source'], fstype, opts_list, notes
 
 
-    elif is_dynamic_or_pseudo_filesystem_type(fstype):
-         return None, [] # Should be filtered earlier, but double-check
+def _handle_other_mount(mount_info, **_):
+    """Fallback for filesystem types without their own handler."""
+    fstype = mount_info['fstype']
+    opts_list = split_options(mount_info['options'])
+    notes = [f"Detected as an unhandled filesystem type: {fstype}."]
+    print(f"Filesystem type '{fstype}' is not explicitly handled. Using captured options/defaults.", file=sys.stderr)
+    # Options are just '' or 'rw' here, so 'defaults' can't already be present
+    if opts_list in ([], ['rw']):
+        opts_list.append('defaults')
+    return mount_info['source'], fstype, opts_list, notes
+
 
+# fstype -> function returning (fstab_source, fstab_fstype, options list, notes), or None to skip the mount
+FSTYPE_HANDLERS = {'cifs': _handle_cifs_mount}
+FSTYPE_HANDLERS.update(dict.fromkeys(STANDARD_FSTYPES, _handle_standard_mount))
 
-    else: # Fallback for unhandled fstypes
-        notes.append(f"Detected as an unhandled filesystem type: {fstype}.")
-        print(f"Filesystem type '{fstype}' is not explicitly handled. Using captured options/defaults.", file=sys.stderr)
-        if not fstab_options or fstab_options == 'rw':
-             if 'defaults' not in fstab_options.split(','):
-                 fstab_options = f"{fstab_options},defaults" if fstab_options else "defaults"
-        fstab_options = ",".join(sorted(list(set(fstab_options.split(',')))))
+def generate_fstab_line(mount_info, credentials=None, interactive=True):
+    """Generates a potential fstab line based on mount info.
+
+    credentials and interactive are passed on to the CIFS handler.
+    """
+    target = mount_info['target']
+    fstype = mount_info['fstype']
+
+    # Subpath mounts (often bind mounts) are handled the same whatever their fstype
+    if mount_info.get('is_subpath_mount', False):
+        handler = _handle_subpath_mount
+    elif is_dynamic_or_pseudo_filesystem_type(fstype):
+        return None, [] # Should be filtered earlier, but double-check
+    else:
+        handler = FSTYPE_HANDLERS.get(fstype, _handle_other_mount)
+
+    result = handler(mount_info, credentials=credentials, interactive=interactive)
+    if result is None:
+        return None, []
+    fstab_source, fstab_fstype, opts_list, notes = result
 
 
     # --- Add nofail if required and not already present (for non-root mounts) ---
-    if should_add_nofail and 'nofail' not in fstab_options.split(','):
-        fstab_options = f"{fstab_options},nofail" if fstab_options else "nofail"
-        fstab_options = fstab_options.strip(',')
-        if 'nofail' in fstab_options.split(','):
-            notes.append("  Added 'nofail' option.")
+    # The handlers leave this to here so it is only checked once
+    if target != '/' and 'nofail' not in opts_list:
+        opts_list.append('nofail')
+        notes.append("  Added 'nofail' option.")
+
+    # Options are collected as a list and joined once here
+    fstab_options = ",".join(opts_list)
 
 
     # --- Construct the final line ---
-    fstab_line = f"{fstab_source}\t{target}\t{fstab_fstype}\t{fstab_options}\t0\t0"
+    # fstab fields are whitespace separated, so spaces/tabs in paths must be octal-escaped
+    fstab_source = fstab_source.replace(' ', '\\040').replace('\t', '\\011')
+    fstab_target = target.replace(' ', '\\040').replace('\t', '\\011')
+    fstab_line = f"{fstab_source}\t{fstab_target}\t{fstab_fstype}\t{fstab_options}\t0\t0"
 
     return fstab_line, notes
 
 
-# (Rest of the script remains the same, including add_line_to_fstab and main)
-# ...
-def add_line_to_fstab(line):
-    """Adds a line to /etc/fstab with a backup using sudo tee."""
+def add_lines_to_fstab(lines):
+    """Appends lines to /etc/fstab in a single write, making one backup first."""
     fstab_path = '/etc/fstab'
     backup_path = '/etc/fstab.bak'
 
-    print(f"\nAttempting to add line to {fstab_path}...")
-    print(f"Line to add: {line}")
+    print(f"\nAttempting to add {len(lines)} line(s) to {fstab_path}...")
 
     if not os.path.exists(fstab_path):
         print(f"Error: {fstab_path} not found.", file=sys.stderr)
@@ -359,33 +452,35 @@ def add_line_to_fstab(line):
         return False
 
 
-    # Create a backup before modifying
+    # Create a backup before modifying (once, so it holds the original fstab)
     try:
         shutil.copyfile(fstab_path, backup_path)
         print(f"Backup created at {backup_path}")
     except Exception as e:
         print(f"Error creating backup of {fstab_path}: {e}", file=sys.stderr)
-        confirm_no_backup = input("Continue adding line WITHOUT creating a backup? (Highly NOT recommended) [yes/no]: ").lower()
+        confirm_no_backup = input("Continue adding lines WITHOUT creating a backup? (Highly NOT recommended) [yes/no]: ").lower()
         if confirm_no_backup != 'yes':
              print("Aborting line addition.")
              return False
         print("Proceeding without backup. Be extremely cautious.")
 
 
-    # Add the line using tee -a
+    # Append the lines directly; we're already root, so no need for a shell + tee
     try:
-        subprocess.run(f"echo '{line}' | tee -a {fstab_path}", shell=True, check=True)
-        print("Line added successfully.")
+        with open(fstab_path, 'a') as f:
+            f.write("".join(line + "\n" for line in lines))
+        for line in lines:
+            print(line)
+        print("Lines added successfully.")
         return True
 
-    except subprocess.CalledProcessError as e:
-        print(f"Error adding line to {fstab_path}.", file=sys.stderr)
-        print(f"Stderr: {e.stderr.strip()}", file=sys.stderr)
+    except OSError as e:
+        print(f"Error adding lines to {fstab_path}: {e}", file=sys.stderr)
         if os.path.exists(backup_path):
              print(f"Your backup is at {backup_path}.", file=sys.stderr)
         return False
     except Exception as e:
-        print(f"An unexpected error occurred while adding the line: {e}", file=sys.stderr)
+        print(f"An unexpected error occurred while adding the lines: {e}", file=sys.stderr)
         if os.path.exists(backup_path):
              print(f"Your backup is at {backup_path}.", file=sys.stderr)
         return False
@@ -398,25 +493,49 @@ def main():
         action='store_true',
         help="Show all active mounts, including common system paths and dynamic/pseudo filesystems like 9p."
     )
+    parser.add_argument(
+        '--creds-json',
+        metavar='PATH',
+        help='JSON file mapping SMB/CIFS mount targets to {"file": PATH} or {"username": ..., "password": ...}.'
+    )
+    parser.add_argument(
+        '--non-interactive',
+        action='store_true',
+        help="Never prompt; SMB/CIFS mounts without --creds-json entries are skipped and /etc/fstab is not modified."
+    )
     args = parser.parse_args()
 
     fstab_path = '/etc/fstab'
 
-    # --- Check for SOURCEPATH support ---
-    sourcepath_supported = False
-    test_output = run_command("findmnt -l --output SOURCE,TARGET,FSTYPE,OPTIONS,SOURCEPATH")
-    if test_output is not None and 'SOURCEPATH' in test_output.splitlines()[0].split():
-         sourcepath_supported = True
-         mount_output = test_output
-    else:
-         mount_output = run_command("findmnt -l --output SOURCE,TARGET,FSTYPE,OPTIONS")
-         if mount_output is None:
-              print("Could not get basic mount info from findmnt. Exiting.", file=sys.stderr)
-              return
-
-
-    active_mounts = parse_mount_output(mount_output, include_sourcepath=sourcepath_supported)
-    if not active_mounts:
+    cifs_credentials = {}
+    if args.creds_json:
+        try:
+            with open(args.creds_json, 'r') as f:
+                cifs_credentials = json.load(f)
+            # Expect {TARGET: {"file": PATH} or {"username": ..., "password": ...}}
+            if not isinstance(cifs_credentials, dict):
+                raise ValueError("expected a JSON object mapping mount targets to credentials")
+            for target, credentials in cifs_credentials.items():
+                if not isinstance(credentials, dict) or not all(isinstance(value, str) for value in credentials.values()):
+                    raise ValueError(f"credentials for {target} must be an object of string values")
+        except (OSError, ValueError) as e:
+            print(f"Error reading credentials file {args.creds_json}: {e}", file=sys.stderr)
+            return
+
+    # Drop pseudo filesystems while parsing rather than after; the check in the
+    # loop below still catches anything that gets through
+    skip_fstypes = frozenset() if args.show_all else DYNAMIC_FSTYPES
+
+    # Read the kernel mount table directly; only fall back to findmnt if /proc isn't available
+    mount_table = parse_mountinfo(skip_fstypes=skip_fstypes)
+    if mount_table is None:
+        mount_table = get_findmnt_mounts(skip_fstypes)
+        if mount_table is None:
+            print("Could not get basic mount info from findmnt. Exiting.", file=sys.stderr)
+            return
+    active_mounts, dropped_targets = mount_table
+
+    if not active_mounts and not dropped_targets:
         print("No active mount points found.", file=sys.stderr)
         return
 
@@ -429,11 +548,13 @@ def main():
 
     generated_lines_info = []
 
-    print(f"\nScanning complete. Found {len(active_mounts)} total mounts.")
+    print(f"\nScanning complete. Found {len(active_mounts) + len(dropped_targets)} total mounts.")
     print(f"Checking each against {fstab_path}...")
 
-    skipped_system = 0
-    skipped_dynamic = 0
+    # Pseudo filesystems dropped by the parser are counted as the loop below would have:
+    # system targets first, then dynamic/pseudo
+    skipped_system = sum(1 for target in dropped_targets if is_system_mount_target(target))
+    skipped_dynamic = len(dropped_targets) - skipped_system
     already_in_fstab = 0
 
     for mount in active_mounts:
@@ -462,7 +583,7 @@ def main():
             already_in_fstab += 1
             continue
 
-        line, notes = generate_fstab_line(mount)
+        line, notes = generate_fstab_line(mount, cifs_credentials.get(target), not args.non_interactive)
         if line:
              generated_lines_info.append((line, notes))
 
@@ -501,9 +622,12 @@ def main():
     print("You can manually copy and paste the lines above into /etc/fstab")
     print("using a text editor with root privileges (e.g., `sudo nano /etc/fstab`).")
     print("Alternatively, you can use the `tee` command for each line:")
+    # Build all the commands first and write them out in one go
+    tee_commands = []
     for line, _ in generated_lines_info:
-        escaped_line = line.replace("'", "'\\''")
-        print(f"echo '{escaped_line}' | sudo tee -a {fstab_path}")
+        # printf rather than echo, as some shells' echo would turn \040 into a space
+        tee_commands.append(f"printf '%s\\n' {shlex.quote(line)} | sudo tee -a {fstab_path}\n")
+    sys.stdout.write("".join(tee_commands))
 
     print("\nAfter adding the lines, you can test them without rebooting using: `sudo mount -a`")
     print("This command attempts to mount all file systems listed in fstab that are not already mounted.")
@@ -511,16 +635,16 @@ def main():
     # Offer to add automatically - requires running the script with sudo
     if os.geteuid() != 0:
         print("\nTo have the script automatically add these lines, please run the script itself with sudo:")
-        print(f"sudo python3 {sys.argv[0]} {'--show-all' if args.show_all else ''}".strip())
+        print(f"sudo python3 {shlex.join(sys.argv)}")
+    elif args.non_interactive:
+        print(f"\nNon-interactive mode: {fstab_path} has not been modified.")
     else:
         add_automatically = input("\nRun the script to automatically add these lines now? (Requires sudo) [yes/no]: ").lower()
         if add_automatically == 'yes':
             print("\nAttempting to add lines automatically...")
-            for line, _ in generated_lines_info:
-                 if not add_line_to_fstab(line):
-                     print(f"\nFailed to add line: {line}", file=sys.stderr)
-                     print("Please check the error message and manually add the remaining lines.", file=sys.stderr)
-                     break
+            if not add_lines_to_fstab([line for line, _ in generated_lines_info]):
+                print("\nFailed to add the lines.", file=sys.stderr)
+                print("Please check the error message and add the lines manually.", file=sys.stderr)
 
             print("\nAutomatic addition process finished. Please test with `sudo mount -a`.")
 
@@ -2,80 +2,146 @@
 # Author: Roy Wiseman 2025-02
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import os
 import sys
 import json
-from datetime import datetime
+import time
+try:
+    import orjson # Optional: parses and pretty-prints the j1 payload several times faster
+except ImportError:
+    orjson = None
 
 # ANSI escape codes for colors
 BRIGHT_WHITE = "\033[1;37m"
 RESET_COLOR = "\033[0m"
 
-USAGE_LINE = f"{BRIGHT_WHITE}Usage: weather.py [location] [-1|-2|-3 for days of text output | -json for JSON data]{RESET_COLOR}"
+USAGE_LINE = f"{BRIGHT_WHITE}Usage: weather.py [location] [-0 for current conditions only | -1|-2|-3 for days of text output | -json for JSON data]{RESET_COLOR}"
 USAGE_LINE_DEFAULT_GRAPHICAL = f"{BRIGHT_WHITE} (Default: graphical view for current location if no options given){RESET_COLOR}"
 
+# One session for all requests, so connections to ip-api.com and wttr.in are kept alive and reused
+SESSION = requests.Session()
+SESSION.headers.update({"Accept-Language": "en-US,en;q=0.5"})
+_adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=Retry(total=2, backoff_factor=0.3))
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
+# The IP-based location rarely changes, so remember it for a while instead of asking ip-api.com every run
+LOCATION_CACHE_FILE = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "weather_loc.json")
+LOCATION_CACHE_TTL = 6 * 3600 # seconds
+
+# wttr.in one-line format for current conditions only: a few hundred bytes instead of the ~50 KB j1 JSON
+CURRENT_ONLY_FORMAT = "?format=%l:+%C+%t+(feels+like+%f),+humidity+%h,+wind+%w"
+
+
+def parse_json(content):
+    """Parses a JSON response body (bytes), with orjson if it is installed."""
+    # Parsing the raw bytes skips decoding them to a str first
+    return orjson.loads(content) if orjson else json.loads(content)
 
 def print_usage():
-    print(USAGE_LINE)
-    print(USAGE_LINE_DEFAULT_GRAPHICAL)
+    # stderr, so it never ends up in piped output such as -json
+    print(USAGE_LINE, file=sys.stderr)
+    print(USAGE_LINE_DEFAULT_GRAPHICAL, file=sys.stderr)
+
+def load_cached_location():
+    """Returns the location saved by get_current_location if it is recent enough, else None."""
+    try:
+        with open(LOCATION_CACHE_FILE, "r") as f:
+            cached = json.load(f)
+        if time.time() - cached["ts"] < LOCATION_CACHE_TTL:
+            return cached["loc"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
 
 def get_current_location():
     """Tries to get the current location based on IP address."""
+    location = load_cached_location()
+    if location:
+        return location
     try:
-        response = requests.get("http://ip-api.com/json/?fields=city,country,status,message", timeout=5)
+        response = SESSION.get("http://ip-api.com/json/?fields=city,country,status,message", timeout=5)
         response.raise_for_status()
         data = response.json()
         if data.get("status") == "success" and data.get("city"):
-            return f"{data['city']}, {data['country']}"
+            location = f"{data['city']}, {data['country']}"
         else:
             # Do not print error here, handle it in the main logic
             return None
     except: # Catch all exceptions for simplicity in this helper
         return None
 
-def get_weather_ascii_art(location_query):
-    """Fetches and displays weather from wttr.in in ASCII art format."""
+    try:
+        os.makedirs(os.path.dirname(LOCATION_CACHE_FILE), exist_ok=True)
+        with open(LOCATION_CACHE_FILE, "w") as f:
+            json.dump({"loc": location, "ts": time.time()}, f)
+    except OSError:
+        pass # Caching is only an optimisation
+    return location
+
+def fetch_wttr(location_query, query="", timeout=10, stream=False):
+    """Fetches wttr.in for a location, returning (location name, response).
+
+    With no location, the IP-based location (cached for a few hours) is looked
+    up first and sent to wttr.in, so the forecast is for the place we print.
+    If that lookup fails, wttr.in works one out itself and the name is None.
+    """
     if not location_query:
         location_query = get_current_location()
-        if not location_query:
-            print(f"{BRIGHT_WHITE}Could not auto-detect location for ASCII view. Please specify one.{RESET_COLOR}")
-            return
-        print(f"{BRIGHT_WHITE}Fetching ASCII weather for auto-detected: {location_query}...{RESET_COLOR}")
-    else:
-        print(f"{BRIGHT_WHITE}Fetching ASCII weather for: {location_query}...{RESET_COLOR}")
+        if location_query:
+            print(f"{BRIGHT_WHITE}Auto-detected location: {location_query}{RESET_COLOR}")
+
+    url = f"http://wttr.in/{location_query or ''}{query}"
+    return location_query, SESSION.get(url, timeout=timeout, stream=stream)
+
+
+def get_weather_ascii_art(location_query):
+    """Fetches and displays weather from wttr.in in ASCII art format."""
+    where = location_query or "auto-detected location"
+    print(f"{BRIGHT_WHITE}Fetching ASCII weather for: {where}...{RESET_COLOR}")
 
-    url = f"http://wttr.in/{location_query}"
-    headers = {"Accept-Language": "en-US,en;q=0.5"}
     try:
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        print(response.text)
+        _, response = fetch_wttr(location_query, timeout=15, stream=True)
+        with response:
+            response.raise_for_status()
+            response.encoding = response.encoding or "utf-8"
+            # Write the page out as it arrives rather than waiting for all of it
+            for chunk in response.iter_content(chunk_size=4096, decode_unicode=True):
+                sys.stdout.write(chunk)
+                sys.stdout.flush()
+        print()
     except requests.exceptions.Timeout:
-        print(f"{BRIGHT_WHITE}Error: Request timed out for {location_query}.{RESET_COLOR}")
+        print(f"{BRIGHT_WHITE}Error: Request timed out for {where}.{RESET_COLOR}")
     except requests.exceptions.RequestException as e:
-        print(f"{BRIGHT_WHITE}Error fetching ASCII weather for {location_query}: {e}{RESET_COLOR}")
+        print(f"{BRIGHT_WHITE}Error fetching ASCII weather for {where}: {e}{RESET_COLOR}")
     except Exception as e:
         print(f"{BRIGHT_WHITE}An unexpected error occurred: {e}{RESET_COLOR}")
 
 
 def get_weather_text_details(location_query, forecast_days):
     """Fetches and displays detailed text weather information."""
-    resolved_location = location_query
-    if not resolved_location:
-        resolved_location = get_current_location()
-        if not resolved_location:
-            print(f"{BRIGHT_WHITE}Could not auto-detect location. Please specify one.{RESET_COLOR}")
-            return
-        print(f"{BRIGHT_WHITE}Fetching detailed weather for auto-detected: {resolved_location}...{RESET_COLOR}")
-    else:
-        print(f"{BRIGHT_WHITE}Fetching detailed weather for: {resolved_location}...{RESET_COLOR}")
+    from datetime import date # Only the text view needs it
+    resolved_location = location_query or "auto-detected location"
+    print(f"{BRIGHT_WHITE}Fetching detailed weather for: {resolved_location}...{RESET_COLOR}")
 
-    url = f"http://wttr.in/{resolved_location}?format=j1"
     try:
-        response = requests.get(url, timeout=10)
+        if forecast_days == 0:
+            # No forecast wanted, so skip the full JSON and let wttr.in format the current conditions
+            detected_location, response = fetch_wttr(location_query, CURRENT_ONLY_FORMAT)
+            resolved_location = detected_location or resolved_location
+            response.raise_for_status()
+            print(response.text.strip())
+            return
+
+        detected_location, response = fetch_wttr(location_query, "?format=j1")
+        resolved_location = detected_location or resolved_location
         response.raise_for_status()
-        weather_data = response.json()
+        weather_data = parse_json(response.content)
 
         current_condition = weather_data.get('current_condition', [{}])[0]
+        current_desc = (current_condition.get('weatherDesc') or [{}])[0]
         area = weather_data.get('nearest_area', [{}])[0]
         
         place_name_list = area.get('areaName', [])
@@ -90,34 +156,39 @@ def get_weather_text_details(location_query, forecast_days):
         if region_disp and region_disp != place_disp: display_loc += f", {region_disp}"
         if country_disp and country_disp not in display_loc : display_loc += f", {country_disp}"
 
-        print(f"\n{BRIGHT_WHITE}Weather for: {display_loc}{RESET_COLOR}")
-        print(f"Condition:     {current_condition.get('weatherDesc', [{}])[0].get('value', 'N/A')}")
-        print(f"Temperature:   {current_condition.get('temp_C', 'N/A')}°C (Feels like: {current_condition.get('FeelsLikeC', 'N/A')}°C)")
-        print(f"Humidity:      {current_condition.get('humidity', 'N/A')}%")
-        print(f"Wind:          {current_condition.get('windspeedKmph', 'N/A')} km/h {current_condition.get('winddir16Point', 'N/A')}")
+        # Collect the report and write it out in one go
+        lines = [
+            f"\n{BRIGHT_WHITE}Weather for: {display_loc}{RESET_COLOR}",
+            f"Condition:     {current_desc.get('value', 'N/A')}",
+            f"Temperature:   {current_condition.get('temp_C', 'N/A')}°C (Feels like: {current_condition.get('FeelsLikeC', 'N/A')}°C)",
+            f"Humidity:      {current_condition.get('humidity', 'N/A')}%",
+            f"Wind:          {current_condition.get('windspeedKmph', 'N/A')} km/h {current_condition.get('winddir16Point', 'N/A')}",
+        ]
         # ... (add other current condition details as needed) ...
 
         available_forecast = weather_data.get('weather', [])
         days_to_show = min(forecast_days, len(available_forecast))
 
         if days_to_show > 0:
-            print(f"\n{BRIGHT_WHITE}--- {days_to_show}-Day Detailed Forecast ---{RESET_COLOR}")
+            lines.append(f"\n{BRIGHT_WHITE}--- {days_to_show}-Day Detailed Forecast ---{RESET_COLOR}")
         for i in range(days_to_show):
             day_fc = available_forecast[i]
-            date_obj = datetime.strptime(day_fc.get('date'), '%Y-%m-%d')
-            day_name = "Today" if i == 0 else ("Tomorrow" if i == 1 else date_obj.strftime('%A, %b %d'))
+            astro = (day_fc.get('astronomy') or [{}])[0]
+            # fromisoformat is a fast C path; strptime would also import _strptime and locale data
+            day_name = ("Today", "Tomorrow")[i] if i < 2 else date.fromisoformat(day_fc.get('date')).strftime('%A, %b %d')
             
-            print(f"\n{BRIGHT_WHITE}{day_name} ({day_fc.get('date')}):{RESET_COLOR}")
-            print(f"  Avg Temp:    {day_fc.get('avgtempC', 'N/A')}°C (Min: {day_fc.get('mintempC', 'N/A')}°C, Max: {day_fc.get('maxtempC', 'N/A')}°C)")
-            print(f"  Sunrise:     {day_fc.get('astronomy', [{}])[0].get('sunrise', 'N/A')}")
-            print(f"  Sunset:      {day_fc.get('astronomy', [{}])[0].get('sunset', 'N/A')}")
+            lines.append(f"\n{BRIGHT_WHITE}{day_name} ({day_fc.get('date')}):{RESET_COLOR}")
+            lines.append(f"  Avg Temp:    {day_fc.get('avgtempC', 'N/A')}°C (Min: {day_fc.get('mintempC', 'N/A')}°C, Max: {day_fc.get('maxtempC', 'N/A')}°C)")
+            lines.append(f"  Sunrise:     {astro.get('sunrise', 'N/A')}")
+            lines.append(f"  Sunset:      {astro.get('sunset', 'N/A')}")
             
-            print("  Hourly Summary:")
-            for hour_data in day_fc.get('hourly', []):
-                time_formatted = f"{int(hour_data.get('time', '0'))//100:02}:00"
-                # Show only a few key hours or summarize if needed
-                if int(hour_data.get('time', '0')) % 300 == 0: # e.g. 00:00, 03:00, 06:00 etc.
-                     print(f"    {time_formatted}: {hour_data.get('tempC', 'N/A')}°C, {hour_data.get('weatherDesc', [{}])[0].get('value', 'N/A')}, Rain: {hour_data.get('chanceofrain', 'N/A')}%")
+            lines.append("  Hourly Summary:")
+            # Show only a few key hours (00:00, 03:00, 06:00 etc.), parsing each time once
+            hours = ((int(h.get('time', '0')), h) for h in day_fc.get('hourly', []))
+            for hour_time, hour_data in [(t, h) for t, h in hours if t % 300 == 0]:
+                hour_desc = (hour_data.get('weatherDesc') or [{}])[0]
+                lines.append(f"    {hour_time//100:02}:00: {hour_data.get('tempC', 'N/A')}°C, {hour_desc.get('value', 'N/A')}, Rain: {hour_data.get('chanceofrain', 'N/A')}%")
+        sys.stdout.write("\n".join(lines) + "\n")
 
     except requests.exceptions.Timeout:
         print(f"{BRIGHT_WHITE}Error: Request for detailed weather timed out for {resolved_location}.{RESET_COLOR}")
@@ -130,23 +201,19 @@ def get_weather_text_details(location_query, forecast_days):
 
 def get_raw_json_data(location_query):
     """Fetches and prints the raw JSON data from wttr.in."""
-    resolved_location = location_query
-    if not resolved_location:
-        resolved_location = get_current_location()
-        if not resolved_location:
-            print(f"{BRIGHT_WHITE}Could not auto-detect location for JSON data. Please specify one.{RESET_COLOR}")
-            return
-        print(f"{BRIGHT_WHITE}Fetching JSON data for auto-detected: {resolved_location}...{RESET_COLOR}")
-    else:
-        print(f"{BRIGHT_WHITE}Fetching JSON data for: {resolved_location}...{RESET_COLOR}")
+    resolved_location = location_query or "auto-detected location"
+    print(f"{BRIGHT_WHITE}Fetching JSON data for: {resolved_location}...{RESET_COLOR}")
 
-    url = f"http://wttr.in/{resolved_location}?format=j1"
     try:
-        response = requests.get(url, timeout=10)
+        detected_location, response = fetch_wttr(location_query, "?format=j1")
+        resolved_location = detected_location or resolved_location
         response.raise_for_status()
         # Pretty print the JSON
-        parsed_json = response.json()
-        print(json.dumps(parsed_json, indent=2)) 
+        parsed_json = parse_json(response.content)
+        if orjson:
+            print(orjson.dumps(parsed_json, option=orjson.OPT_INDENT_2).decode())
+        else:
+            print(json.dumps(parsed_json, indent=2))
     except requests.exceptions.Timeout:
         print(f"{BRIGHT_WHITE}Error: Request for JSON data timed out for {resolved_location}.{RESET_COLOR}")
     except requests.exceptions.RequestException as e:
@@ -160,9 +227,14 @@ def get_raw_json_data(location_query):
 
 
 if __name__ == "__main__":
-    print_usage() # Print usage every time
-
     args = sys.argv[1:]
+
+    # Show usage when run bare (then carry on with the default view) or when asked for help
+    if not args:
+        print_usage()
+    elif '-h' in args or '--help' in args:
+        print_usage()
+        sys.exit(0)
     
     mode = 'ascii_art' # Default mode
     days_text_output = 3 # Default for ascii mode, not explicitly used but implies full view
@@ -170,7 +242,7 @@ if __name__ == "__main__":
     location_parts = []
 
     for arg in args:
-        if arg in ['-1', '-2', '-3']:
+        if arg in ['-0', '-1', '-2', '-3']:
             mode = 'text_details'
             days_text_output = int(arg[1:])
         elif arg == '-json':
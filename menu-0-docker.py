@@ -6,6 +6,7 @@ import subprocess
 import time
 import signal
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 LOG_FILE = "/tmp/python_setup_menus.log"
@@ -17,10 +18,12 @@ def log_message(message):
 
 def list_scripts(folder, prefix="docker"):
     """List all scripts in the folder starting with the specified prefix."""
-    scripts = [
-        f for f in os.listdir(folder)
-        if f.startswith(prefix) and f.endswith(".sh") and os.path.isfile(os.path.join(folder, f))
-    ]
+    # scandir entries already know their type, so no extra stat per file
+    with os.scandir(folder) as entries:
+        scripts = [
+            entry.name for entry in entries
+            if entry.name.startswith(prefix) and entry.name.endswith(".sh") and entry.is_file()
+        ]
     log_message(f"Scripts found: {scripts}")
     return sorted(scripts)
 
@@ -40,6 +43,7 @@ def read_first_comment(file_path):
 def display_menu(stdscr, options, script_dir):
     """Display a list of options with checkboxes and show the first comment of selected script."""
     curses.curs_set(0)
+    stdscr.leaveok(True)  # Cursor is hidden, so don't spend time moving it
     curses.start_color()
     curses.init_pair(1, curses.COLOR_BLACK, curses.COLOR_WHITE)  # Highlighted
     curses.init_pair(2, curses.COLOR_WHITE, curses.COLOR_BLACK)  # Normal
@@ -48,16 +52,31 @@ def display_menu(stdscr, options, script_dir):
     current_column = 0  # Track which column the user is in
     checked = [False] * len(options)
     select_all = False  # Track whether all items are selected or not
+    drawn_idx = None  # Highlighted cell currently on screen; None forces a full redraw
+    # Read every description once up front rather than reopening a script on each keypress,
+    # several at a time since each one is mostly waiting on the disk
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        descriptions = list(executor.map(read_first_comment, (os.path.join(script_dir, option) for option in options)))
+
+    def draw_cell(idx, highlighted):
+        """Draw one grid cell, using the layout worked out in the loop below."""
+        row = idx % num_rows
+        col = idx // num_rows
+        if row < height - 5:  # Ensure within bounds
+            checkbox = "[X]" if checked[idx] else "[ ]"
+            stdscr.addstr(row, col * max_option_width, f"{checkbox} {options[idx][:max_option_width-4]}",
+                          curses.color_pair(1 if highlighted else 2))
 
     while True:
         try:
-            stdscr.clear()
             height, width = stdscr.getmaxyx()
 
             # Minimum size check
             if height < 10 or width < 40:
+                stdscr.clear()
                 stdscr.addstr(0, 0, "Terminal size too small. Resize and try again.")
                 stdscr.refresh()
+                drawn_idx = None
                 time.sleep(1)
                 continue
 
@@ -65,40 +84,32 @@ def display_menu(stdscr, options, script_dir):
             max_option_width = max(len(option) for option in options) + 4
             num_columns = max(1, width // max_option_width)
             num_rows = (len(options) + num_columns - 1) // num_columns
-
-            # Display the menu in a grid layout
-            for idx, option in enumerate(options):
-                row = idx % num_rows
-                col = idx // num_rows
-
-                x = col * max_option_width
-                y = row
-
-                if y < height - 5:  # Ensure within bounds
-                    checkbox = "[X]" if checked[idx] else "[ ]"
-                    if col == current_column and row == current_row:
-                        # Highlight the selected cell
-                        stdscr.attron(curses.color_pair(1))
-                        stdscr.addstr(y, x, f"{checkbox} {option[:max_option_width-4]}")
-                        stdscr.attroff(curses.color_pair(1))
-                    else:
-                        # Non-selected cells just show normally without modification
-                        stdscr.attron(curses.color_pair(2))
-                        stdscr.addstr(y, x, f"{checkbox} {option[:max_option_width-4]}")
-                        stdscr.attroff(curses.color_pair(2))
-
-            # Display footer and comments
+            current_idx = current_column * num_rows + current_row
             footer_row = min(height - 3, num_rows + 1)
-            stdscr.addstr(footer_row, 0, "Press 'space' to select an item, Ctrl+a to toggle select all, 'x' to execute selected items, or 'q' to quit.", curses.A_BOLD)
+
+            if drawn_idx is None:
+                # Full redraw of the grid and footer (first pass, resize, or checkboxes changed)
+                stdscr.erase()
+                for idx in range(len(options)):
+                    draw_cell(idx, idx == current_idx)
+                stdscr.addstr(footer_row, 0, "Press 'space' to select an item, Ctrl+a to toggle select all, 'x' to execute selected items, or 'q' to quit.", curses.A_BOLD)
+            elif drawn_idx != current_idx:
+                # Moving the cursor only changes the old and new highlighted cells
+                draw_cell(drawn_idx, False)
+                draw_cell(current_idx, True)
+            drawn_idx = current_idx
 
             # Display the first comment of the highlighted script
             comment_row = footer_row + 1
-            if 0 <= current_column * num_rows + current_row < len(options):
-                script_path = os.path.join(script_dir, options[current_column * num_rows + current_row])
-                comment = read_first_comment(script_path)
+            stdscr.move(comment_row, 0)
+            stdscr.clrtobot()
+            if 0 <= current_idx < len(options):
+                comment = descriptions[current_idx]
                 stdscr.addstr(comment_row, 0, comment[:width-1])
 
-            stdscr.refresh()
+            # Push all the changes to the terminal in one update
+            stdscr.noutrefresh()
+            curses.doupdate()
 
             # Handle user input
             key = stdscr.getch()
@@ -136,9 +147,13 @@ def display_menu(stdscr, options, script_dir):
                 idx = current_column * num_rows + current_row
                 if 0 <= idx < len(options):
                     checked[idx] = not checked[idx]
+                    drawn_idx = None
             elif key == 1:  # Ctrl+a to toggle select all
                 select_all = not select_all
                 checked = [select_all] * len(options)
+                drawn_idx = None
+            elif key == curses.KEY_RESIZE:
+                drawn_idx = None
             elif key == ord("x"):  # Execute selected scripts
                 return [options[i] for i, is_checked in enumerate(checked) if is_checked]
             elif key == ord("q"):  # Quit without running scripts
@@ -146,7 +161,7 @@ def display_menu(stdscr, options, script_dir):
 
         except curses.error as e:
             log_message(f"Curses error: {e}")
-            pass
+            drawn_idx = None
 
 def run_scripts(script_dir, selected_scripts):
     """Run the selected scripts interactively in order with streaming output and timing."""
@@ -163,9 +178,14 @@ def run_scripts(script_dir, selected_scripts):
         print("-" * 40)
 
         try:
-            # Determine if the script contains "nosudo"
+            # Determine if the script contains "nosudo"; the marker goes in the
+            # header comments, so only the start of the file needs checking
             with open(script_path, "r") as f:
-                nosudo = "nosudo" in f.read()
+                nosudo = "nosudo" in f.read(1024)
+
+            # The script writes straight to our terminal, so get our own header out first;
+            # otherwise it can appear after the script's output when stdout is a pipe
+            sys.stdout.flush()
 
             # Run with or without sudo based on "nosudo"
             if nosudo:
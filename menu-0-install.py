@@ -163,9 +163,10 @@ def run_scripts(script_dir, selected_scripts):
         print("-" * 40)
 
         try:
-            # Determine if the script contains "nosudo"
+            # Determine if the script contains "nosudo"; the marker goes in the
+            # header comments, so only the start of the file needs checking
             with open(script_path, "r") as f:
-                nosudo = "nosudo" in f.read()
+                nosudo = "nosudo" in f.read(1024)
 
             # Run with or without sudo based on "nosudo"
             if nosudo: